@@ -0,0 +1,482 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from api_fetch import ApiClient
+from api_writes import WriteOp, run_writes
+
+
+def build_dataset(users=10, posts_per_user=10, todos_per_user=20, comments_per_post=5):
+    """
+    Build JSONPlaceholder-shaped data for the stand-in server
+
+    Args:
+        users (int): Number of users
+        posts_per_user (int): Posts written by each user
+        todos_per_user (int): Todos owned by each user
+        comments_per_post (int): Comments on each post
+
+    Returns:
+        dict: Resource name -> {id: item}
+    """
+    data = {"users": {}, "posts": {}, "todos": {}, "comments": {}}
+    for user_id in range(1, users + 1):
+        data["users"][user_id] = {
+            "id": user_id,
+            "name": f"User {user_id}",
+            "username": f"user{user_id}",
+            "email": f"user{user_id}@example.com"
+        }
+        for _ in range(posts_per_user):
+            post_id = len(data["posts"]) + 1
+            data["posts"][post_id] = {
+                "userId": user_id,
+                "id": post_id,
+                "title": f"post {post_id} title",
+                "body": f"body of post {post_id} " * 8
+            }
+            for _ in range(comments_per_post):
+                comment_id = len(data["comments"]) + 1
+                data["comments"][comment_id] = {
+                    "postId": post_id,
+                    "id": comment_id,
+                    "name": f"comment {comment_id}",
+                    "email": f"commenter{comment_id}@example.com",
+                    "body": f"comment body {comment_id} " * 4
+                }
+        for _ in range(todos_per_user):
+            todo_id = len(data["todos"]) + 1
+            data["todos"][todo_id] = {
+                "userId": user_id,
+                "id": todo_id,
+                "title": f"todo {todo_id}",
+                "completed": todo_id % 3 == 0
+            }
+    return data
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the JSONPlaceholder endpoints"""
+
+    # Keep-alive needs HTTP/1.1 and a Content-Length on every response
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload=None, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _inject_faults(self):
+        """Apply configured latency and errors; return True if an error was sent"""
+        # Always consume the request body so a keep-alive connection stays in sync
+        self.body = self._read_body()
+        server = self.server
+        delay = server.latency + random.uniform(0, server.jitter)
+        if delay:
+            time.sleep(delay)
+        if server.error_rate and random.random() < server.error_rate:
+            if random.random() < 0.5:
+                self._send_json(429, {"error": "slow down"}, {"Retry-After": "0.1"})
+            else:
+                self._send_json(503, {"error": "unavailable"})
+            return True
+        return False
+
+    def _route(self):
+        """Split the path into (resource, item id or None, query dict)"""
+        parts = urlsplit(self.path)
+        segments = [segment for segment in parts.path.split("/") if segment]
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if not segments or segments[0] not in self.server.data or len(segments) > 2:
+            return None, None, query
+        item_id = None
+        if len(segments) == 2:
+            if not segments[1].isdigit():
+                return None, None, query
+            item_id = int(segments[1])
+        return segments[0], item_id, query
+
+    def do_GET(self):
+        if self._inject_faults():
+            return
+        resource, item_id, query = self._route()
+        if resource is None:
+            self._send_json(404, {})
+            return
+
+        with self.server.lock:
+            items = self.server.data[resource]
+            if item_id is not None:
+                payload = items.get(item_id)
+                if payload is None:
+                    self._send_json(404, {})
+                    return
+            else:
+                payload = self._list(resource, items, query)
+                if isinstance(payload, tuple):
+                    payload, link = payload
+                else:
+                    link = None
+
+        body = json.dumps(payload).encode()
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send_json(304, None, {"ETag": etag})
+            return
+        headers = {"ETag": etag}
+        if item_id is None and link:
+            headers["Link"] = link
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _list(self, resource, items, query):
+        """Filter and paginate a collection like json-server does"""
+        page = query.pop("_page", None)
+        limit = query.pop("_limit", None)
+        id_gte = query.pop("id_gte", None)
+
+        selected = list(items.values())
+        if id_gte is not None:
+            selected = [item for item in selected if item["id"] >= int(id_gte)]
+        for field, value in query.items():
+            selected = [item for item in selected if str(item.get(field)).lower() == value.lower()]
+
+        if page is None and limit is None:
+            return selected
+        page = int(page or 1)
+        limit = int(limit or 10)
+        start = (page - 1) * limit
+        # Like json-server, every page links to the first and last page
+        host = self.headers.get("Host")
+        last = max(1, -(-len(selected) // limit))
+        links = [(1, "first")]
+        if start + limit < len(selected):
+            links.append((page + 1, "next"))
+        links.append((last, "last"))
+        link = ", ".join(
+            f'<http://{host}/{resource}?_page={number}&_limit={limit}>; rel="{rel}"'
+            for number, rel in links
+        )
+        return selected[start:start + limit], link
+
+    def do_POST(self):
+        if self._inject_faults():
+            return
+        resource, item_id, _ = self._route()
+        if resource is None or item_id is not None:
+            self._send_json(404, {})
+            return
+        item = self.body
+        with self.server.lock:
+            # Like JSONPlaceholder, writes are acknowledged but not persisted
+            item["id"] = max(self.server.data[resource], default=0) + 1
+        self._send_json(201, item)
+
+    def _write_item(self, merge):
+        if self._inject_faults():
+            return
+        resource, item_id, _ = self._route()
+        with self.server.lock:
+            existing = self.server.data.get(resource, {}).get(item_id) if resource else None
+        if existing is None:
+            self._send_json(404, {})
+            return
+        item = dict(existing) if merge else {}
+        item.update(self.body)
+        item["id"] = item_id
+        self._send_json(200, item)
+
+    def do_PUT(self):
+        self._write_item(merge=False)
+
+    def do_PATCH(self):
+        self._write_item(merge=True)
+
+    def do_DELETE(self):
+        if self._inject_faults():
+            return
+        resource, item_id, _ = self._route()
+        with self.server.lock:
+            exists = resource is not None and item_id in self.server.data[resource]
+        self._send_json(200 if exists else 404, {})
+
+
+class StandInServer:
+    """Local JSONPlaceholder stand-in with latency and error injection"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 data=None):
+        """
+        Create the server (it is not started yet)
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0: pick a free port)
+            latency (float): Seconds added to every response
+            jitter (float): Extra random delay of up to this many seconds
+            error_rate (float): Fraction of requests answered with 429 or 503
+            data (dict, optional): Dataset from build_dataset() (default: a new one)
+        """
+        self.httpd = ThreadingHTTPServer((host, port), StandInHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.data = data or build_dataset()
+        self.httpd.lock = threading.Lock()
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.error_rate = error_rate
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class _Recorder:
+    """Counts requests and response bytes through a session response hook"""
+
+    def __init__(self, client):
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+        client.session.hooks["response"].append(self._on_response)
+
+    def _on_response(self, response, *args, **kwargs):
+        with self._lock:
+            self.requests += 1
+            self.bytes += int(response.headers.get("Content-Length") or 0)
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _scenario_single(client, iterations, options):
+    for i in range(iterations):
+        yield lambda todo_id=i % 200 + 1: client.fetch_todo(todo_id) is not None
+
+
+def _scenario_list(client, iterations, options):
+    for _ in range(iterations):
+        yield lambda: client.fetch_all_posts() is not None
+
+
+def _scenario_paged_list(client, iterations, options):
+    # Also a regression check: paging must return every post exactly once,
+    # including when the last page is full (100 posts in pages of 10)
+    for _ in range(iterations):
+        yield lambda: (
+            [post["id"] for post in client.iter_resource("posts", page_size=10)]
+            == [post["id"] for post in client.fetch_all_posts() or []]
+        )
+
+
+def _scenario_bulk_ids(client, iterations, options):
+    batch = options["batch_size"]
+    for i in range(iterations):
+        ids = [(i * batch + offset) % 100 + 1 for offset in range(batch)]
+        yield lambda ids=ids: all(
+            result.error is None
+            for result in client.fetch_many("posts", ids, options["concurrency"])
+        )
+
+
+def _scenario_mixed_writes(client, iterations, options):
+    batch = options["batch_size"]
+    actions = ["create", "patch", "update", "delete"]
+    for i in range(iterations):
+        ops = [
+            WriteOp(actions[n % 4], n % 100 + 1, {"title": f"bench {n}", "body": "x", "userId": 1})
+            for n in range(i * batch, (i + 1) * batch)
+        ]
+        yield lambda ops=ops: all(
+            result.ok
+            for result in run_writes(ops, client=client, max_workers=options["concurrency"],
+                                     backoff=0.01)
+        )
+
+
+SCENARIOS = {
+    "single": _scenario_single,
+    "list": _scenario_list,
+    "paged_list": _scenario_paged_list,
+    "bulk_ids": _scenario_bulk_ids,
+    "mixed_writes": _scenario_mixed_writes
+}
+
+
+def run_scenario(name, base_url, iterations=50, batch_size=20, concurrency=8):
+    """
+    Run one benchmark scenario against a server
+
+    Args:
+        name (str): Scenario name, one of SCENARIOS
+        base_url (str): Root URL of the server under test
+        iterations (int): Number of timed operations
+        batch_size (int): Items per operation for the bulk scenarios
+        concurrency (int): Requests in flight for the bulk scenarios
+
+    Returns:
+        dict: Throughput, latency percentiles (ms), bytes parsed and errors
+    """
+    options = {"batch_size": batch_size, "concurrency": concurrency}
+    with ApiClient(base_url, pool_maxsize=max(10, concurrency)) as client:
+        recorder = _Recorder(client)
+        latencies = []
+        errors = 0
+        started = time.perf_counter()
+        for operation in SCENARIOS[name](client, iterations, options):
+            op_started = time.perf_counter()
+            if not operation():
+                errors += 1
+            latencies.append(time.perf_counter() - op_started)
+        duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "operations": iterations,
+        "requests": recorder.requests,
+        "errors": errors,
+        "duration_s": round(duration, 4),
+        "ops_per_s": round(iterations / duration, 2) if duration else 0.0,
+        "requests_per_s": round(recorder.requests / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "bytes_parsed": recorder.bytes
+    }
+
+
+def append_history(path, results, label=None):
+    """
+    Append a benchmark run to a JSON Lines history file
+
+    Args:
+        path (str): History file
+        results (list): Scenario reports from run_scenario
+        label (str, optional): Free-form label, e.g. a branch or commit
+    """
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "results": results
+    }
+    with open(path, "a") as history:
+        history.write(json.dumps(record) + "\n")
+
+
+def display_results(results):
+    """
+    Display scenario reports as a table
+
+    Args:
+        results (list): Scenario reports from run_scenario
+    """
+    print(f"\n{'scenario':<14}{'ops/s':>10}{'req/s':>10}{'p50 ms':>10}"
+          f"{'p95 ms':>10}{'p99 ms':>10}{'bytes':>12}{'errors':>8}")
+    for result in results:
+        print(f"{result['scenario']:<14}{result['ops_per_s']:>10}{result['requests_per_s']:>10}"
+              f"{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}"
+              f"{result['bytes_parsed']:>12}{result['errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark api_fetch against a stand-in server")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added per response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 429/503 responses")
+    parser.add_argument("--base-url", help="benchmark this server instead of the stand-in")
+    parser.add_argument("--history", default="bench_history.jsonl", help="JSON Lines file to append to")
+    parser.add_argument("--label", help="label stored with this run in the history")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = StandInServer(latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate).start()
+        base_url = server.base_url
+
+    try:
+        print(f"Benchmarking against {base_url}...")
+        results = [
+            run_scenario(name, base_url, args.iterations, args.batch_size, args.concurrency)
+            for name in args.scenarios
+        ]
+    finally:
+        if server is not None:
+            server.stop()
+
+    display_results(results)
+    if args.history:
+        append_history(args.history, results, args.label)
+        print(f"\nResults appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import shelve
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# A cached response: the parsed JSON plus the validators needed to revalidate it
+CacheEntry = namedtuple("CacheEntry", ["data", "etag", "last_modified", "stored_at"])
+
+
+class CacheStats:
+    """Counters describing how well a response cache is doing"""
+
+    def __init__(self):
+        """Start every counter at zero"""
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def as_dict(self):
+        """Return the counters as a dictionary"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+class ResponseCache:
+    """
+    Base class for response caches
+
+    Subclasses store CacheEntry objects by key; this class handles TTL
+    freshness and the hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_entries=256, ttl=60):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of entries before evicting
+            ttl (float, optional): Seconds an entry is served without revalidation (None: forever)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def is_fresh(self, entry):
+        """
+        Check whether an entry can be served without contacting the server
+
+        Args:
+            entry (CacheEntry): Entry to check
+
+        Returns:
+            bool: True if the entry is still within its TTL
+        """
+        return self.ttl is None or time.time() - entry.stored_at < self.ttl
+
+    def lookup(self, key):
+        """
+        Look up an entry and record a hit or miss
+
+        Stale entries are still returned so their validators can be used
+        for a conditional request, but they count as a miss.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (entry or None, whether the entry is fresh)
+        """
+        with self._lock:
+            entry = self._get(key)
+            fresh = entry is not None and self.is_fresh(entry)
+            if fresh:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+            return entry, fresh
+
+    def store(self, key, data, etag=None, last_modified=None):
+        """
+        Store a parsed response
+
+        Args:
+            key (str): Cache key
+            data (dict or list): Parsed JSON body
+            etag (str, optional): ETag response header
+            last_modified (str, optional): Last-Modified response header
+        """
+        with self._lock:
+            self._set(key, CacheEntry(data, etag, last_modified, time.time()))
+            while self._len() > self.max_entries:
+                self._evict_one()
+                self.stats.evictions += 1
+
+    def revalidated(self, key, entry):
+        """
+        Mark an entry as confirmed by a 304 response and restart its TTL
+
+        Args:
+            key (str): Cache key
+            entry (CacheEntry): The entry the server confirmed
+        """
+        with self._lock:
+            self._set(key, entry._replace(stored_at=time.time()))
+            self.stats.revalidations += 1
+
+    def invalidate(self, key):
+        """
+        Drop an entry, e.g. after a write to the same resource
+
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            self._delete(key)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._clear()
+
+    def __len__(self):
+        with self._lock:
+            return self._len()
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, entry):
+        raise NotImplementedError
+
+    def _delete(self, key):
+        raise NotImplementedError
+
+    def _clear(self):
+        raise NotImplementedError
+
+    def _len(self):
+        raise NotImplementedError
+
+    def _evict_one(self):
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """In-memory LRU response cache"""
+
+    def __init__(self, max_entries=256, ttl=60):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of entries before evicting
+            ttl (float, optional): Seconds an entry is served without revalidation (None: forever)
+        """
+        super().__init__(max_entries, ttl)
+        self._entries = OrderedDict()
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            # Mark as most recently used
+            self._entries.move_to_end(key)
+        return entry
+
+    def _set(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+    def _delete(self, key):
+        self._entries.pop(key, None)
+
+    def _clear(self):
+        self._entries.clear()
+
+    def _len(self):
+        return len(self._entries)
+
+    def _evict_one(self):
+        self._entries.popitem(last=False)
+
+
+class DiskCache(ResponseCache):
+    """
+    On-disk response cache backed by shelve
+
+    Entries are pickled, so cached payloads are restored without
+    re-parsing JSON. The cache survives restarts; the LRU order is kept
+    in memory and rebuilt from entry timestamps when the file is opened.
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=None):
+        """
+        Open (or create) the cache file
+
+        Args:
+            path (str): Path of the shelve database
+            max_entries (int): Maximum number of entries before evicting
+            ttl (float, optional): Seconds an entry is served without revalidation (None: forever)
+        """
+        super().__init__(max_entries, ttl)
+        self._shelf = shelve.open(path)
+        stored = sorted((self._shelf[key].stored_at, key) for key in self._shelf.keys())
+        self._order = OrderedDict((key, None) for _, key in stored)
+
+    def _get(self, key):
+        entry = self._shelf.get(key)
+        if entry is not None:
+            self._order.move_to_end(key)
+        return entry
+
+    def _set(self, key, entry):
+        self._shelf[key] = entry
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def _delete(self, key):
+        self._shelf.pop(key, None)
+        self._order.pop(key, None)
+
+    def _clear(self):
+        self._shelf.clear()
+        self._order.clear()
+
+    def _len(self):
+        return len(self._order)
+
+    def _evict_one(self):
+        oldest_key, _ = self._order.popitem(last=False)
+        del self._shelf[oldest_key]
+
+    def close(self):
+        """Flush and close the cache file"""
+        with self._lock:
+            self._shelf.close()
@@ -1,51 +1,770 @@
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
+import codecs
 import json
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
 
+from api_metrics import (
+    RequestEvent, TimedHTTPAdapter, connection_timings, endpoint_template,
+    reset_connection_timings
+)
+from renderer import render_records
 
-def fetch_todo():
+# Root URL of the JSONPlaceholder API (override with API_BASE_URL, e.g. for a local server)
+BASE_URL = os.getenv("API_BASE_URL", "https://jsonplaceholder.typicode.com")
+
+# Outcome of one item in a bulk fetch: data is None when error is set
+FetchResult = namedtuple("FetchResult", ["id", "data", "error"])
+
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_NUMBER_CHARS = "0123456789+-.eE"
+
+
+def iter_json_array(chunks):
+    """
+    Incrementally parse a top-level JSON array, yielding one element at a time
+
+    Only the unparsed tail of the input is buffered, so memory stays
+    proportional to the largest element rather than the whole document.
+
+    Args:
+        chunks (iterable): Text chunks of the JSON document
+
+    Yields:
+        Each element of the array, in order
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    eof = False
+    # "start" expects '[', "first" a value or ']', "value" a value, "separator" ',' or ']'
+    state = "start"
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+            pos += 1
+
+        if pos == len(buffer) or state == "more":
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            # Drop the consumed prefix and read the next chunk
+            buffer = buffer[pos:]
+            pos = 0
+            try:
+                buffer += next(chunks)
+            except StopIteration:
+                eof = True
+            if state == "more":
+                state = "value"
+            continue
+
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            pos += 1
+            state = "first"
+        elif state == "separator":
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' at offset {pos}")
+            pos += 1
+            state = "value"
+        elif char == "]" and state == "first":
+            return
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # The element is split across chunks
+                state = "more"
+                continue
+            if (not eof and isinstance(item, (int, float))
+                    and not buffer[end:].strip(_JSON_NUMBER_CHARS)):
+                # A number running to the end of the buffer may continue in the next chunk
+                state = "more"
+                continue
+            pos = end
+            state = "separator"
+            yield item
+
+
+class ApiClient:
+    """Pooled, keep-alive HTTP client for the JSONPlaceholder API"""
+
+    def __init__(self, base_url=BASE_URL, pool_connections=10, pool_maxsize=10,
+                 timeout=(3.05, 10), keep_alive=True, max_retries=0, cache=None,
+                 mirror=None):
+        """
+        Initialize the client and its connection pool
+
+        Args:
+            base_url (str): Root URL of the API
+            pool_connections (int): Number of per-host pools to keep
+            pool_maxsize (int): Maximum connections kept open per host
+            timeout (float or tuple): Request timeout, or (connect, read) timeouts in seconds
+            keep_alive (bool): Reuse connections between requests
+            max_retries (int): Number of retries on connection failures
+            cache (ResponseCache, optional): Cache for GET responses (see api_cache)
+            mirror (ApiMirror, optional): Local mirror answering reads by id (see api_mirror)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.cache = cache
+        self.mirror = mirror
+
+        self.observers = []
+
+        # One session means one connection pool shared by every request
+        self.session = requests.Session()
+        self._adapter_options = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "max_retries": max_retries
+        }
+        self._mount(HTTPAdapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def _mount(self, adapter_class):
+        adapter = adapter_class(**self._adapter_options)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def add_observer(self, observer):
+        """
+        Report every request to an observer
+
+        The first observer switches the session to connections that time
+        DNS lookup and connection setup; idle pooled connections are dropped.
+        Streamed requests (stream=True) are reported when the response is
+        closed, e.g. at the end of a with block, so the event includes the
+        body bytes and the time the caller spent parsing between chunks.
+
+        Args:
+            observer (RequestObserver): Receives a RequestEvent per request (see api_metrics)
+        """
+        if not self.observers:
+            self._mount(TimedHTTPAdapter)
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        """
+        Stop reporting requests to an observer
+
+        Args:
+            observer (RequestObserver): A previously added observer
+        """
+        self.observers.remove(observer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def url(self, path):
+        """
+        Build an absolute URL for an API path
+
+        Args:
+            path (str): Path relative to the base URL, e.g. "posts/1",
+                or an absolute URL which is returned unchanged
+
+        Returns:
+            str: Absolute URL
+        """
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        """
+        Send a request through the pooled session
+
+        Args:
+            method (str): HTTP method
+            path (str): Path relative to the base URL
+            **kwargs: Extra arguments passed to requests.Session.request
+
+        Returns:
+            requests.Response: The raw response (status is not checked)
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if not self.observers:
+            return self.session.request(method, self.url(path), **kwargs)
+
+        reset_connection_timings()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.url(path), **kwargs)
+        except requests.RequestException as e:
+            self._notify(method, path, None, started, error=e)
+            raise
+
+        if kwargs.get("stream"):
+            self._observe_stream(method, path, response, started)
+            return response
+
+        decode_time = None
+        if response.content and "json" in response.headers.get("Content-Type", ""):
+            # Decode now so the decode time is part of this request's event;
+            # later response.json() calls return the already-parsed value
+            decode_started = time.perf_counter()
+            try:
+                data = response.json()
+            except ValueError:
+                pass
+            else:
+                response.json = lambda **kwargs: data
+            decode_time = time.perf_counter() - decode_started
+
+        self._notify(method, path, response, started, decode_time)
+        return response
+
+    def _observe_stream(self, method, path, response, started):
+        """Report a streamed response once it is closed, with its body size and parse time"""
+        timings = connection_timings()
+        state = {"bytes": 0, "reading": 0.0, "first_chunk": None, "reported": False}
+        iter_content = response.iter_content
+        close = response.close
+
+        def counted_content(chunk_size=1, decode_unicode=False):
+            chunks = iter_content(chunk_size, decode_unicode)
+            while True:
+                read_started = time.perf_counter()
+                chunk = next(chunks, None)
+                state["reading"] += time.perf_counter() - read_started
+                if chunk is None:
+                    return
+                if state["first_chunk"] is None:
+                    state["first_chunk"] = read_started
+                state["bytes"] += len(chunk)
+                yield chunk
+
+        def close_and_report():
+            close()
+            if state["reported"]:
+                return
+            state["reported"] = True
+            decode_time = None
+            if state["first_chunk"] is not None:
+                # Time between chunks not spent reading went to the caller's parser
+                body_time = time.perf_counter() - state["first_chunk"]
+                decode_time = max(0.0, body_time - state["reading"])
+            self._notify(method, path, response, started, decode_time,
+                         body_bytes=state["bytes"], timings=timings)
+
+        response.iter_content = counted_content
+        response.close = close_and_report
+
+    def _notify(self, method, path, response, started, decode_time=None, error=None,
+                body_bytes=None, timings=None):
+        total_time = time.perf_counter() - started - (decode_time or 0.0)
+        dns_time, connect_time = timings or connection_timings()
+        if body_bytes is None and response is not None:
+            body_bytes = len(response.content)
+        event = RequestEvent(
+            method=method,
+            endpoint=endpoint_template(urlsplit(self.url(path)).path),
+            status=response.status_code if response is not None else None,
+            dns_time=dns_time,
+            connect_time=connect_time,
+            ttfb=response.elapsed.total_seconds() if response is not None else None,
+            total_time=total_time,
+            bytes=body_bytes,
+            decode_time=decode_time,
+            error=error
+        )
+        for observer in self.observers:
+            try:
+                observer.on_request(event)
+            except Exception as e:
+                # The request itself has completed; a broken observer must not fail it
+                print(f"Error in request observer {type(observer).__name__}: {e}")
+
+    def get_json(self, path, params=None, **kwargs):
+        """
+        GET a path and return its parsed JSON body
+
+        When the client has a cache, fresh entries are served without a
+        request and stale ones are revalidated with If-None-Match and
+        If-Modified-Since; a 304 reuses the cached data without re-parsing.
+        Cached data is shared between callers and must not be modified.
+
+        Args:
+            path (str): Path relative to the base URL
+            params (dict, optional): Query string parameters
+            **kwargs: Extra arguments passed to requests.Session.request
+
+        Returns:
+            dict or list: Parsed JSON response
+
+        Raises:
+            requests.RequestException: On connection errors or bad status codes
+        """
+        if self.cache is None:
+            response = self.request("GET", path, params=params, **kwargs)
+            response.raise_for_status()
+            return response.json()
+
+        key = self._cache_key(path, params)
+        entry, fresh = self.cache.lookup(key)
+        if fresh:
+            return entry.data
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = self.request("GET", path, params=params, headers=headers, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self.cache.revalidated(key, entry)
+            return entry.data
+
+        response.raise_for_status()
+        data = response.json()
+        self.cache.store(
+            key,
+            data,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+        return data
+
+    def invalidate(self, path, params=None):
+        """
+        Drop a cached GET response
+
+        Args:
+            path (str): Path relative to the base URL
+            params (dict, optional): Query string parameters of the cached request
+        """
+        if self.cache is not None:
+            self.cache.invalidate(self._cache_key(path, params))
+        if self.mirror is not None and not params:
+            # Reads of a written resource go to the API until the next full sync
+            self.mirror.mark_stale(path.strip("/").partition("/")[0])
+
+    def _cache_key(self, path, params=None):
+        key = self.url(path)
+        if params:
+            key += "?" + urlencode(sorted(params.items()))
+        return key
+
+    def fetch_todo(self, todo_id=1):
+        """
+        Fetch a todo item
+
+        Args:
+            todo_id (int): ID of the todo (default: 1)
+
+        Returns:
+            dict: Todo item data
+        """
+        if self.mirror is not None and self.mirror.is_synced("todos"):
+            todo = self.mirror.get_todo(todo_id)
+            if todo is not None:
+                return todo
+
+        try:
+            return self.get_json(f"todos/{todo_id}")
+        except requests.RequestException as e:
+            print(f"Error fetching data: {e}")
+            return None
+
+    def fetch_post(self, post_id):
+        """
+        Fetch a single post
+
+        Args:
+            post_id (int): ID of the post
+
+        Returns:
+            dict: Post data
+        """
+        if self.mirror is not None and self.mirror.is_synced("posts"):
+            post = self.mirror.get_post(post_id)
+            if post is not None:
+                return post
+
+        try:
+            return self.get_json(f"posts/{post_id}")
+        except requests.RequestException as e:
+            print(f"Error fetching post: {e}")
+            return None
+
+    def fetch_all_posts(self):
+        """
+        Fetch all posts
+
+        Returns:
+            list: List of post dictionaries
+        """
+        if self.mirror is not None and self.mirror.is_synced("posts"):
+            return self.mirror.all("posts")
+
+        try:
+            return self.get_json("posts")
+        except requests.RequestException as e:
+            print(f"Error fetching posts: {e}")
+            return None
+
+    def create_post(self, title, body, user_id=1):
+        """
+        Create a new post
+
+        Args:
+            title (str): Title of the post
+            body (str): Body content of the post
+            user_id (int): User ID (default: 1)
+
+        Returns:
+            dict: Created post data from the API response
+        """
+        post_data = {
+            "title": title,
+            "body": body,
+            "userId": user_id
+        }
+
+        try:
+            response = self.request("POST", "posts", json=post_data)
+            response.raise_for_status()
+            self.invalidate("posts")
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Error creating post: {e}")
+            return None
+
+    def update_post(self, post_id, title=None, body=None, user_id=None, existing_post=None):
+        """
+        Replace an existing post with PUT
+
+        Missing fields are filled in from the current post. It is only
+        fetched when a field is missing and existing_post was not given.
+
+        Args:
+            post_id (int): ID of the post to update
+            title (str, optional): New title of the post
+            body (str, optional): New body content of the post
+            user_id (int, optional): New user ID
+            existing_post (dict, optional): Already-fetched copy of the post
+
+        Returns:
+            dict: Updated post data from the API response
+        """
+        path = f"posts/{post_id}"
+
+        try:
+            # Fetch the existing post only if we need its values
+            if existing_post is None and None in (title, body, user_id):
+                existing_post = self.get_json(path)
+
+            # Prepare the update data (keep existing values if not provided)
+            update_data = {
+                "title": title if title is not None else existing_post['title'],
+                "body": body if body is not None else existing_post['body'],
+                "userId": user_id if user_id is not None else existing_post['userId'],
+                "id": post_id
+            }
+
+            response = self.request("PUT", path, json=update_data)
+            response.raise_for_status()
+            self.invalidate(path)
+            self.invalidate("posts")
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Error updating post: {e}")
+            return None
+
+    def patch_post(self, post_id, title=None, body=None, user_id=None):
+        """
+        Partially update a post with PATCH, sending only the given fields
+
+        Args:
+            post_id (int): ID of the post to update
+            title (str, optional): New title of the post
+            body (str, optional): New body content of the post
+            user_id (int, optional): New user ID
+
+        Returns:
+            dict: Updated post data from the API response
+        """
+        path = f"posts/{post_id}"
+        changes = {
+            key: value
+            for key, value in (("title", title), ("body", body), ("userId", user_id))
+            if value is not None
+        }
+
+        try:
+            response = self.request("PATCH", path, json=changes)
+            response.raise_for_status()
+            self.invalidate(path)
+            self.invalidate("posts")
+            return response.json()
+        except requests.RequestException as e:
+            print(f"Error updating post: {e}")
+            return None
+
+    def delete_post(self, post_id, preflight=True):
+        """
+        Delete a post
+
+        Args:
+            post_id (int): ID of the post to delete
+            preflight (bool): Fetch the post first to verify it exists and
+                return its data; pass False to send only the DELETE
+
+        Returns:
+            tuple: (success, deleted post data or None without preflight)
+        """
+        path = f"posts/{post_id}"
+
+        try:
+            # First verify the post exists
+            post_to_delete = self.get_json(path) if preflight else None
+
+            response = self.request("DELETE", path)
+            response.raise_for_status()
+            self.invalidate(path)
+            self.invalidate("posts")
+            return True, post_to_delete
+        except requests.RequestException as e:
+            print(f"Error deleting post: {e}")
+            return False, None
+
+    def iter_resource(self, resource, page_size=None, params=None, chunk_size=65536):
+        """
+        Stream the items of a collection, parsing them one at a time
+
+        The response body is read in chunks and parsed incrementally, so
+        the first item is yielded before the download finishes. With
+        page_size, the collection is requested page by page using
+        _page/_limit. When the server sends Link headers, rel="next" is
+        followed until a page has none; otherwise pages are counted until
+        one comes back short or empty.
+
+        Args:
+            resource (str): Resource collection, e.g. "posts"
+            page_size (int, optional): Items per page (default: no paging)
+            params (dict, optional): Extra query string parameters
+            chunk_size (int): Bytes read from the socket at a time
+
+        Yields:
+            dict: Each item of the collection
+
+        Raises:
+            requests.RequestException: On connection errors or bad status codes
+            ValueError: If a response body is not a JSON array
+        """
+        params = dict(params or {})
+        page = 1
+        url = resource
+        query = dict(params, _page=page, _limit=page_size) if page_size else params
+
+        previous_first = None
+        # Once the server pages with Link headers, only its links are followed
+        linked = False
+
+        while url:
+            count = 0
+            next_url = None
+            with self.request("GET", url, params=query, stream=True) as response:
+                response.raise_for_status()
+                decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+                text_chunks = (
+                    decoder.decode(chunk) for chunk in response.iter_content(chunk_size)
+                )
+                for item in iter_json_array(text_chunks):
+                    if count == 0:
+                        if item == previous_first:
+                            # The server ignored the paging parameters
+                            break
+                        previous_first = item
+                    count += 1
+                    yield item
+                else:
+                    linked = linked or bool(response.links)
+                    next_url = response.links.get("next", {}).get("url")
+
+            if not count:
+                url = None
+            elif next_url:
+                # The Link header carries the full query string
+                url, query = next_url, None
+            elif linked:
+                # The last page has no rel="next"
+                url = None
+            elif page_size and count == page_size:
+                page += 1
+                query = dict(params, _page=page, _limit=page_size)
+            else:
+                url = None
+
+    def iter_posts(self, page_size=None):
+        """
+        Stream all posts one at a time
+
+        Args:
+            page_size (int, optional): Posts per page (default: no paging)
+
+        Yields:
+            dict: Each post
+        """
+        try:
+            yield from self.iter_resource("posts", page_size=page_size)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error fetching posts: {e}")
+
+    async def fetch_many_async(self, resource, ids, concurrency=None):
+        """
+        Fetch many items of a resource concurrently
+
+        Blocking requests run on a thread pool while a semaphore caps how
+        many are in flight, so the connection pool is never oversubscribed.
+
+        Args:
+            resource (str): Resource collection, e.g. "posts" or "todos"
+            ids (iterable): IDs of the items to fetch
+            concurrency (int, optional): Maximum requests in flight (default: pool size)
+
+        Returns:
+            list: FetchResult for each ID, in the same order as ids
+        """
+        concurrency = concurrency or self.pool_maxsize
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            async def fetch_one(item_id):
+                async with semaphore:
+                    try:
+                        data = await loop.run_in_executor(
+                            executor, self.get_json, f"{resource}/{item_id}"
+                        )
+                        return FetchResult(item_id, data, None)
+                    except requests.RequestException as e:
+                        # Keep the error with its item instead of failing the batch
+                        return FetchResult(item_id, None, e)
+
+            # gather preserves the order of its arguments
+            return await asyncio.gather(*(fetch_one(item_id) for item_id in ids))
+
+    def fetch_many(self, resource, ids, concurrency=None):
+        """
+        Blocking wrapper around fetch_many_async
+
+        Args:
+            resource (str): Resource collection, e.g. "posts" or "todos"
+            ids (iterable): IDs of the items to fetch
+            concurrency (int, optional): Maximum requests in flight (default: pool size)
+
+        Returns:
+            list: FetchResult for each ID, in the same order as ids
+        """
+        return asyncio.run(self.fetch_many_async(resource, ids, concurrency))
+
+    def close(self):
+        """Close the session and release pooled connections"""
+        self.session.close()
+
+
+# Shared client used by the module-level functions below
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Return the shared ApiClient, creating it on first use
+
+    Returns:
+        ApiClient: The process-wide default client
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = ApiClient()
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replace the shared ApiClient used by the module-level functions
+
+    Args:
+        client (ApiClient): Client to use from now on
+    """
+    global _default_client
+    with _default_client_lock:
+        previous, _default_client = _default_client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def fetch_todo(todo_id=1):
     """
     Fetch todo data from JSONPlaceholder API
     
+    Args:
+        todo_id (int): ID of the todo (default: 1)
+    
     Returns:
         dict: Todo item data
     """
-    url = "https://jsonplaceholder.typicode.com/todos/1"
-    
-    try:
-        # Make GET request to the API
-        response = requests.get(url)
-        
-        # Raise an exception for bad status codes
-        response.raise_for_status()
-        
-        # Parse JSON response
-        todo_data = response.json()
-        return todo_data
-        
-    except requests.RequestException as e:
-        print(f"Error fetching data: {e}")
-        return None
+    return get_default_client().fetch_todo(todo_id)
+
 
+def _format_todo(todo):
+    """Human-readable text for a todo item"""
+    return (
+        "\n=== Todo Item ===\n"
+        f"User ID: {todo['userId']}\n"
+        f"Todo ID: {todo['id']}\n"
+        f"Title: {todo['title']}\n"
+        f"Completed: {todo['completed']}\n"
+        # Raw JSON for reference
+        "\nRaw JSON:\n"
+        f"{json.dumps(todo, indent=2)}\n"
+    )
 
-def display_todo(todo):
+
+def display_todo(todo, fmt="human", stream=None):
     """
     Display todo item in a formatted way
     
     Args:
         todo (dict): Todo item data
+        fmt (str): Output format: "human", "jsonl" or "csv"
+        stream (file, optional): Where to write (default: stdout)
     """
-    if todo:
-        print("\n=== Todo Item ===")
-        print(f"User ID: {todo['userId']}")
-        print(f"Todo ID: {todo['id']}")
-        print(f"Title: {todo['title']}")
-        print(f"Completed: {todo['completed']}")
-        
-        # Print raw JSON for reference
-        print("\nRaw JSON:")
-        print(json.dumps(todo, indent=2))
-    else:
-        print("No data to display")
+    render_records(
+        [todo] if todo else [],
+        _format_todo,
+        fmt=fmt,
+        stream=stream,
+        empty_message="No data to display\n"
+    )
 
 
 def fetch_all_posts():
@@ -55,42 +774,81 @@ def fetch_all_posts():
     Returns:
         list: List of post dictionaries
     """
-    url = "https://jsonplaceholder.typicode.com/posts"
+    return get_default_client().fetch_all_posts()
+
+
+def iter_posts(page_size=None):
+    """
+    Stream posts from JSONPlaceholder API, parsing them one at a time
     
-    try:
-        # Make GET request to the API
-        response = requests.get(url)
-        
-        # Raise an exception for bad status codes
-        response.raise_for_status()
-        
-        # Parse JSON response
-        posts_data = response.json()
-        return posts_data
-        
-    except requests.RequestException as e:
-        print(f"Error fetching posts: {e}")
-        return None
+    Args:
+        page_size (int, optional): Posts per page when the endpoint is paginated
+    
+    Yields:
+        dict: Each post
+    """
+    return get_default_client().iter_posts(page_size)
+
+
+def fetch_posts_by_ids(ids, concurrency=None):
+    """
+    Fetch many posts concurrently from JSONPlaceholder API
+    
+    Args:
+        ids (iterable): IDs of the posts to fetch
+        concurrency (int, optional): Maximum requests in flight
+    
+    Returns:
+        list: FetchResult(id, data, error) per ID, in request order
+    """
+    return get_default_client().fetch_many("posts", ids, concurrency)
+
+
+def fetch_todos_by_ids(ids, concurrency=None):
+    """
+    Fetch many todos concurrently from JSONPlaceholder API
+    
+    Args:
+        ids (iterable): IDs of the todos to fetch
+        concurrency (int, optional): Maximum requests in flight
+    
+    Returns:
+        list: FetchResult(id, data, error) per ID, in request order
+    """
+    return get_default_client().fetch_many("todos", ids, concurrency)
+
+
+def _format_post(post):
+    """Human-readable text for a post"""
+    return (
+        f"\nPost #{post['id']}\n"
+        f"User ID: {post['userId']}\n"
+        f"Title: {post['title']}\n"
+        f"Body: {post['body']}\n"
+        f"{'-' * 50}\n"
+    )
 
 
-def display_posts(posts):
+def display_posts(posts, fmt="human", stream=None):
     """
     Display all posts in a formatted way
     
+    Output is buffered and starts as soon as the first posts arrive, so
+    a generator such as iter_posts() is displayed while it streams.
+    
     Args:
-        posts (list): List of post dictionaries
+        posts (iterable): Post dictionaries, e.g. a list or iter_posts()
+        fmt (str): Output format: "human", "jsonl" or "csv"
+        stream (file, optional): Where to write (default: stdout)
     """
-    if not posts:
-        print("No posts to display")
-        return
-        
-    print("\n=== All Posts ===")
-    for post in posts:
-        print(f"\nPost #{post['id']}")
-        print(f"User ID: {post['userId']}")
-        print(f"Title: {post['title']}")
-        print(f"Body: {post['body']}")
-        print("-" * 50)
+    render_records(
+        posts,
+        _format_post,
+        fmt=fmt,
+        stream=stream,
+        header="\n=== All Posts ===\n",
+        empty_message="No posts to display\n"
+    )
 
 
 def create_post(title, body, user_id=1):
@@ -105,29 +863,7 @@ def create_post(title, body, user_id=1):
     Returns:
         dict: Created post data from the API response
     """
-    url = "https://jsonplaceholder.typicode.com/posts"
-    
-    # Prepare the post data
-    post_data = {
-        "title": title,
-        "body": body,
-        "userId": user_id
-    }
-    
-    try:
-        # Make POST request to the API
-        response = requests.post(url, json=post_data)
-        
-        # Raise an exception for bad status codes
-        response.raise_for_status()
-        
-        # Parse JSON response
-        created_post = response.json()
-        return created_post
-        
-    except requests.RequestException as e:
-        print(f"Error creating post: {e}")
-        return None
+    return get_default_client().create_post(title, body, user_id)
 
 
 def display_created_post(post):
@@ -148,7 +884,7 @@ def display_created_post(post):
         print("Failed to create post")
 
 
-def update_post(post_id, title=None, body=None, user_id=None):
+def update_post(post_id, title=None, body=None, user_id=None, existing_post=None):
     """
     Update an existing post via JSONPlaceholder API
     
@@ -157,37 +893,28 @@ def update_post(post_id, title=None, body=None, user_id=None):
         title (str, optional): New title of the post
         body (str, optional): New body content of the post
         user_id (int, optional): New user ID
+        existing_post (dict, optional): Already-fetched post, saves a GET
     
     Returns:
         dict: Updated post data from the API response
     """
-    url = f"https://jsonplaceholder.typicode.com/posts/{post_id}"
+    return get_default_client().update_post(post_id, title, body, user_id, existing_post)
+
+
+def patch_post(post_id, title=None, body=None, user_id=None):
+    """
+    Partially update a post via JSONPlaceholder API, sending only changed fields
     
-    try:
-        # First fetch the existing post
-        response = requests.get(url)
-        response.raise_for_status()
-        existing_post = response.json()
-        
-        # Prepare the update data (keep existing values if not provided)
-        update_data = {
-            "title": title if title is not None else existing_post['title'],
-            "body": body if body is not None else existing_post['body'],
-            "userId": user_id if user_id is not None else existing_post['userId'],
-            "id": post_id
-        }
-        
-        # Make PUT request to update the post
-        response = requests.put(url, json=update_data)
-        response.raise_for_status()
-        
-        # Parse JSON response
-        updated_post = response.json()
-        return updated_post
-        
-    except requests.RequestException as e:
-        print(f"Error updating post: {e}")
-        return None
+    Args:
+        post_id (int): ID of the post to update
+        title (str, optional): New title of the post
+        body (str, optional): New body content of the post
+        user_id (int, optional): New user ID
+    
+    Returns:
+        dict: Updated post data from the API response
+    """
+    return get_default_client().patch_post(post_id, title, body, user_id)
 
 
 def display_updated_post(old_post, new_post):
@@ -217,33 +944,18 @@ def display_updated_post(old_post, new_post):
     print("\nNote: In JSONPlaceholder API, updates are not persisted.")
 
 
-def delete_post(post_id):
+def delete_post(post_id, preflight=True):
     """
     Delete a post via JSONPlaceholder API
     
     Args:
         post_id (int): ID of the post to delete
+        preflight (bool): Fetch the post before deleting it (default: True)
     
     Returns:
         bool: True if deletion was successful, False otherwise
     """
-    url = f"https://jsonplaceholder.typicode.com/posts/{post_id}"
-    
-    try:
-        # First verify the post exists
-        get_response = requests.get(url)
-        get_response.raise_for_status()
-        post_to_delete = get_response.json()
-        
-        # Make DELETE request to the API
-        delete_response = requests.delete(url)
-        delete_response.raise_for_status()
-        
-        return True, post_to_delete
-        
-    except requests.RequestException as e:
-        print(f"Error deleting post: {e}")
-        return False, None
+    return get_default_client().delete_post(post_id, preflight)
 
 
 def display_deleted_post(success, post):
@@ -261,6 +973,10 @@ def display_deleted_post(success, post):
         print(f"Title: {post['title']}")
         print(f"User ID: {post['userId']}")
         print("\nNote: In JSONPlaceholder API, deletes are not persisted.")
+    elif success:
+        # Deleted without a preflight fetch, so there are no details to show
+        print("\n=== Post Deleted Successfully ===")
+        print("\nNote: In JSONPlaceholder API, deletes are not persisted.")
     else:
         print("Failed to delete post")
 
@@ -274,8 +990,7 @@ def main():
         display_todo(todo)
     elif choice == "2":
         print("Fetching all posts from JSONPlaceholder API...")
-        posts = fetch_all_posts()
-        display_posts(posts)
+        display_posts(iter_posts())
     elif choice == "3":
         print("\n=== Create New Post ===")
         title = input("Enter post title: ")
@@ -290,9 +1005,9 @@ def main():
         post_id = int(input("Enter post ID to update: "))
         
         # Fetch the existing post first
-        url = f"https://jsonplaceholder.typicode.com/posts/{post_id}"
-        response = requests.get(url)
-        old_post = response.json()
+        old_post = get_default_client().fetch_post(post_id)
+        if not old_post:
+            return
         
         print("\nCurrent post details:")
         print(f"Title: {old_post['title']}")
@@ -305,8 +1020,19 @@ def main():
         new_user_id = input("New user ID: ")
         new_user_id = int(new_user_id) if new_user_id else None
         
+        # Only send fields that actually differ from the current post
+        if new_title == old_post['title']:
+            new_title = None
+        if new_body == old_post['body']:
+            new_body = None
+        if new_user_id == old_post['userId']:
+            new_user_id = None
+        if new_title is None and new_body is None and new_user_id is None:
+            print("\nNo changes to apply")
+            return
+        
         print("\nUpdating post...")
-        updated_post = update_post(post_id, new_title, new_body, new_user_id)
+        updated_post = patch_post(post_id, new_title, new_body, new_user_id)
         display_updated_post(old_post, updated_post)
     elif choice == "5":
         print("\n=== Delete Post ===")
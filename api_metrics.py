@@ -0,0 +1,270 @@
+import bisect
+import json
+import re
+import socket
+import threading
+import time
+from collections import namedtuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import HTTPError
+
+# Everything the HTTP layer reports about one request. Times are in seconds;
+# dns_time and connect_time are None when a pooled connection was reused, and
+# decode_time is None when no JSON body was parsed. Streamed responses are
+# reported when closed; their decode_time is the caller's time between chunks.
+RequestEvent = namedtuple("RequestEvent", [
+    "method", "endpoint", "status", "dns_time", "connect_time", "ttfb",
+    "total_time", "bytes", "decode_time", "error"
+])
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Connection setup timings of the request running on this thread
+_connection_timings = threading.local()
+
+
+def endpoint_template(path):
+    """
+    Turn a concrete path into its endpoint template
+
+    Args:
+        path (str): Request path, e.g. "/posts/42/comments?x=1"
+
+    Returns:
+        str: Template with numeric IDs replaced, e.g. "/posts/{id}/comments"
+    """
+    path = path.split("?", 1)[0]
+    return _ID_SEGMENT.sub("/{id}", path) or "/"
+
+
+def reset_connection_timings():
+    """Forget connection timings recorded on this thread"""
+    _connection_timings.dns = None
+    _connection_timings.connect = None
+
+
+def connection_timings():
+    """
+    Return connection timings recorded on this thread since the last reset
+
+    Returns:
+        tuple: (dns seconds, connect seconds); None where no new connection was made
+    """
+    return getattr(_connection_timings, "dns", None), getattr(_connection_timings, "connect", None)
+
+
+class _TimedConnectionMixin:
+    """Records DNS and connect (TCP + TLS) time of new connections"""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            # Let urllib3 resolve again and raise its usual error
+            addresses = None
+        _connection_timings.dns = time.perf_counter() - started
+
+        if not addresses:
+            return super()._new_conn()
+
+        # Connect to the resolved address so the lookup is not repeated
+        hostname = self._dns_host
+        self._dns_host = addresses[0][4][0]
+        try:
+            return super()._new_conn()
+        except (OSError, HTTPError):
+            if len(addresses) == 1:
+                raise
+        finally:
+            self._dns_host = hostname
+        # Fall back to urllib3 trying every address
+        return super()._new_conn()
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        dns_time = getattr(_connection_timings, "dns", None) or 0.0
+        _connection_timings.connect = time.perf_counter() - started - dns_time
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections record DNS and connect timings"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool
+        }
+
+
+class RequestObserver:
+    """
+    Base class for request observers
+
+    Register an observer with ApiClient.add_observer(); on_request is
+    called on the requesting thread after every request, so it should be
+    quick and must not raise (errors are printed and otherwise ignored).
+    """
+
+    def on_request(self, event):
+        """
+        Handle one completed request; the base implementation does nothing
+
+        Args:
+            event (RequestEvent): What happened
+        """
+
+
+class _Histogram:
+    """Fixed-bucket histogram of one series"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, bucket_count):
+        # One extra slot for values above the largest bound (+Inf)
+        self.counts = [0] * (bucket_count + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class LatencyHistogram(RequestObserver):
+    """
+    Aggregates request events into per-endpoint latency histograms
+
+    Each (method, endpoint) pair gets a histogram per phase (total, ttfb,
+    connect, dns, decode), plus request counts by status and byte totals.
+    Recording is a bisect and a few integer increments under a lock.
+    """
+
+    PHASES = ("total", "ttfb", "connect", "dns", "decode")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize an empty aggregator
+
+        Args:
+            buckets (tuple): Ascending bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._requests = {}
+        self._bytes = {}
+        self._lock = threading.Lock()
+
+    def on_request(self, event):
+        key = (event.method, event.endpoint)
+        status = str(event.status) if event.status is not None else "error"
+        values = (event.total_time, event.ttfb, event.connect_time, event.dns_time,
+                  event.decode_time)
+        with self._lock:
+            request_key = key + (status,)
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+            if event.bytes:
+                self._bytes[key] = self._bytes.get(key, 0) + event.bytes
+            for phase, value in zip(self.PHASES, values):
+                if value is None:
+                    continue
+                histogram = self._histograms.get(key + (phase,))
+                if histogram is None:
+                    histogram = self._histograms[key + (phase,)] = _Histogram(len(self.buckets))
+                histogram.counts[bisect.bisect_left(self.buckets, value)] += 1
+                histogram.total += value
+                histogram.count += 1
+
+    def reset(self):
+        """Drop everything recorded so far"""
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+            self._bytes.clear()
+
+    def to_dict(self):
+        """
+        Return the aggregated data
+
+        Returns:
+            dict: Per-endpoint request counts, bytes and phase histograms
+        """
+        endpoints = {}
+        with self._lock:
+            for (method, endpoint, status), count in self._requests.items():
+                entry = endpoints.setdefault(f"{method} {endpoint}", {"requests": {}, "phases": {}})
+                entry["requests"][status] = count
+            for (method, endpoint), total in self._bytes.items():
+                endpoints[f"{method} {endpoint}"]["bytes"] = total
+            for (method, endpoint, phase), histogram in self._histograms.items():
+                bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+                endpoints[f"{method} {endpoint}"]["phases"][phase] = {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "buckets": dict(zip(bounds, histogram.counts))
+                }
+        return endpoints
+
+    def to_json(self, indent=2):
+        """Return the aggregated data as a JSON string"""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix="api_fetch"):
+        """
+        Return the aggregated data in the Prometheus text exposition format
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Metrics text
+        """
+        lines = [f"# TYPE {prefix}_requests_total counter"]
+        with self._lock:
+            for (method, endpoint, status), count in sorted(self._requests.items()):
+                lines.append(
+                    f'{prefix}_requests_total{{method="{method}",endpoint="{endpoint}",'
+                    f'status="{status}"}} {count}'
+                )
+            lines.append(f"# TYPE {prefix}_response_bytes_total counter")
+            for (method, endpoint), total in sorted(self._bytes.items()):
+                lines.append(
+                    f'{prefix}_response_bytes_total{{method="{method}",endpoint="{endpoint}"}} {total}'
+                )
+            lines.append(f"# TYPE {prefix}_request_duration_seconds histogram")
+            for (method, endpoint, phase), histogram in sorted(self._histograms.items()):
+                labels = f'method="{method}",endpoint="{endpoint}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{prefix}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'{prefix}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {histogram.total}")
+                lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
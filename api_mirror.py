@@ -0,0 +1,314 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+
+import requests
+
+from api_fetch import get_default_client
+
+# Mirrored resources: indexed columns (besides id) and the columns that get an index
+RESOURCES = {
+    "posts": {
+        "columns": {"userId": "INTEGER", "title": "TEXT", "body": "TEXT"},
+        "indexes": ["userId"]
+    },
+    "todos": {
+        "columns": {"userId": "INTEGER", "title": "TEXT", "completed": "INTEGER"},
+        "indexes": ["userId", "completed"]
+    },
+    "comments": {
+        "columns": {"postId": "INTEGER", "name": "TEXT", "email": "TEXT", "body": "TEXT"},
+        "indexes": ["postId"]
+    },
+    "users": {
+        "columns": {"name": "TEXT", "username": "TEXT", "email": "TEXT"},
+        "indexes": ["username"]
+    }
+}
+
+
+class ApiMirror:
+    """
+    Local SQLite mirror of the JSONPlaceholder resources
+
+    Each resource gets a table with the item id, a few indexed columns
+    for lookups and the full JSON document. sync() refreshes a table
+    either with a conditional GET (ETag / Last-Modified) of the whole
+    collection or by fetching only ids above the stored high-water mark.
+    """
+
+    def __init__(self, path="api_mirror.db", resources=None):
+        """
+        Open (or create) the mirror database
+
+        Args:
+            path (str): SQLite database file, or ":memory:"
+            resources (dict, optional): Resource definitions (default: RESOURCES)
+        """
+        self.resources = resources or RESOURCES
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "resource TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "high_water INTEGER, synced_at REAL)"
+            )
+            for resource, spec in self.resources.items():
+                columns = "".join(f", {name} {kind}" for name, kind in spec["columns"].items())
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {resource} "
+                    f"(id INTEGER PRIMARY KEY{columns}, data TEXT NOT NULL)"
+                )
+                for column in spec["indexes"]:
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{resource}_{column} ON {resource} ({column})"
+                    )
+
+    def _spec(self, resource):
+        try:
+            return self.resources[resource]
+        except KeyError:
+            raise ValueError(f"Resource is not mirrored: {resource}") from None
+
+    def _upsert(self, resource, items):
+        """Insert or replace items; the caller holds the lock and transaction"""
+        columns = list(self._spec(resource)["columns"])
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO {resource} (id, {', '.join(columns)}, data) "
+            f"VALUES ({placeholders})",
+            (
+                [item["id"], *(item.get(column) for column in columns), json.dumps(item)]
+                for item in items
+            )
+        )
+
+    def sync(self, resource, client=None, mode="etag"):
+        """
+        Refresh one resource from the API
+
+        Args:
+            resource (str): Resource to refresh, e.g. "posts"
+            client (ApiClient, optional): Client to use (default: the shared client)
+            mode (str): "etag" revalidates and replaces the whole collection;
+                "high_water" fetches only items with an id above the newest one stored
+
+        Returns:
+            int: Number of items written (0 when the collection was unchanged)
+
+        Raises:
+            requests.RequestException: On connection errors or bad status codes
+        """
+        self._spec(resource)
+        client = client or get_default_client()
+        state = self.sync_state(resource)
+
+        headers = {}
+        params = None
+        if mode == "high_water":
+            if state and state["high_water"] is not None:
+                params = {"id_gte": state["high_water"] + 1}
+        elif mode == "etag":
+            if state and state["etag"]:
+                headers["If-None-Match"] = state["etag"]
+            if state and state["last_modified"]:
+                headers["If-Modified-Since"] = state["last_modified"]
+        else:
+            raise ValueError(f"Unknown sync mode: {mode}")
+
+        response = client.request("GET", resource, params=params, headers=headers)
+        if response.status_code == 304:
+            self._save_state(resource, state["etag"], state["last_modified"], state["high_water"])
+            return 0
+        response.raise_for_status()
+        items = response.json()
+        # Servers that ignore id_gte return everything; that is still correct
+        high_water = max((item["id"] for item in items), default=None)
+        if state and state["high_water"] is not None:
+            high_water = max(high_water or 0, state["high_water"])
+
+        with self._lock, self._conn:
+            if mode == "etag":
+                # A full listing replaces the table, dropping deleted items
+                self._conn.execute(f"DELETE FROM {resource}")
+            self._upsert(resource, items)
+        self._save_state(
+            resource,
+            response.headers.get("ETag") if mode == "etag" else (state or {}).get("etag"),
+            response.headers.get("Last-Modified") if mode == "etag" else (state or {}).get("last_modified"),
+            high_water
+        )
+        return len(items)
+
+    def sync_all(self, client=None, mode="etag"):
+        """
+        Refresh every mirrored resource
+
+        Args:
+            client (ApiClient, optional): Client to use (default: the shared client)
+            mode (str): Sync mode, see sync()
+
+        Returns:
+            dict: Items written per resource (None where the sync failed)
+        """
+        written = {}
+        for resource in self.resources:
+            try:
+                written[resource] = self.sync(resource, client, mode)
+            except requests.RequestException as e:
+                print(f"Error syncing {resource}: {e}")
+                written[resource] = None
+        return written
+
+    def _save_state(self, resource, etag, last_modified, high_water):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?)",
+                (resource, etag, last_modified, high_water, time.time())
+            )
+
+    def sync_state(self, resource):
+        """
+        Return the stored sync state of a resource
+
+        Args:
+            resource (str): Mirrored resource
+
+        Returns:
+            dict: etag, last_modified, high_water and synced_at, or None if never synced
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, high_water, synced_at FROM sync_state WHERE resource = ?",
+                (resource,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("etag", "last_modified", "high_water", "synced_at"), row))
+
+    def is_synced(self, resource):
+        """Return True if the resource has been synced at least once"""
+        return resource in self.resources and self.sync_state(resource) is not None
+
+    def get(self, resource, item_id):
+        """
+        Look up one item by id
+
+        Args:
+            resource (str): Mirrored resource
+            item_id (int): ID of the item
+
+        Returns:
+            dict: The item, or None if it is not in the mirror
+        """
+        self._spec(resource)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT data FROM {resource} WHERE id = ?", (item_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, resource, **criteria):
+        """
+        Find items whose indexed columns equal the given values
+
+        Args:
+            resource (str): Mirrored resource
+            **criteria: Column/value pairs, e.g. userId=1, completed=True
+
+        Returns:
+            list: Matching items ordered by id
+        """
+        spec = self._spec(resource)
+        for column in criteria:
+            if column != "id" and column not in spec["columns"]:
+                raise ValueError(f"Unknown column for {resource}: {column}")
+        where = " AND ".join(f"{column} = ?" for column in criteria) or "1"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM {resource} WHERE {where} ORDER BY id",
+                tuple(criteria.values())
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def all(self, resource):
+        """Return every item of a resource ordered by id"""
+        return self.find(resource)
+
+    def get_post(self, post_id):
+        """Look up a post by id"""
+        return self.get("posts", post_id)
+
+    def get_todo(self, todo_id):
+        """Look up a todo by id"""
+        return self.get("todos", todo_id)
+
+    def posts_by_user(self, user_id):
+        """Return the posts written by a user"""
+        return self.find("posts", userId=user_id)
+
+    def todos_by_user(self, user_id, completed=None):
+        """
+        Return a user's todos
+
+        Args:
+            user_id (int): ID of the user
+            completed (bool, optional): Only todos with this completed flag
+
+        Returns:
+            list: Matching todos
+        """
+        if completed is None:
+            return self.find("todos", userId=user_id)
+        return self.find("todos", userId=user_id, completed=completed)
+
+    def todos_by_status(self, completed):
+        """Return every todo with the given completed flag"""
+        return self.find("todos", completed=completed)
+
+    def mark_stale(self, resource):
+        """
+        Stop answering reads for a resource until its next sync
+
+        Called after a write through the API. The stored rows are kept,
+        but the sync state is cleared, so is_synced() is False and the next
+        sync() fetches the full collection instead of revalidating.
+
+        Args:
+            resource (str): Mirrored resource
+        """
+        if resource not in self.resources:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sync_state WHERE resource = ?", (resource,))
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "api_mirror.db"
+    mirror = ApiMirror(path)
+    try:
+        print(f"Syncing JSONPlaceholder resources into {path}...")
+        for resource, written in mirror.sync_all().items():
+            if written is None:
+                print(f"- {resource}: failed")
+            else:
+                print(f"- {resource}: {written} items written")
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from api_fetch import get_default_client
+
+# A single write: action is "create", "update" (PUT), "patch" or "delete"
+WriteOp = namedtuple("WriteOp", ["action", "post_id", "data"], defaults=(None, None))
+
+# Outcome of one WriteOp; error is None when ok is True
+WriteResult = namedtuple("WriteResult", ["op", "ok", "status", "data", "error", "attempts"])
+
+# Status codes that mean "slow down and try again"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Retryable statuses where the server did not act on the request, so even a
+# non-idempotent create (POST) can be sent again without risking a duplicate
+UNPROCESSED_STATUSES = {429, 503}
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit shared by the write workers
+
+    Every successful request raises the limit by about one slot per
+    round of requests (additive increase); a throttled or failed request
+    multiplies it by a factor (multiplicative decrease). A Retry-After
+    delay pauses all workers until it has passed.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=32, decrease=0.5, cooldown=1.0):
+        """
+        Initialize the limiter
+
+        Args:
+            initial (int): Starting number of requests in flight
+            minimum (int): Lowest limit allowed
+            maximum (int): Highest limit allowed
+            decrease (float): Factor applied to the limit when throttled
+            cooldown (float): Seconds after a decrease during which further
+                throttles do not decrease again (they usually share a cause)
+        """
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self._condition:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                elif self._in_flight < int(self.limit):
+                    break
+                else:
+                    self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled=False, retry_after=None):
+        """
+        Return a slot and adjust the limit
+
+        Args:
+            throttled (bool): Whether the request was throttled or failed
+            retry_after (float, optional): Seconds the server asked us to wait
+        """
+        with self._condition:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header
+
+    Args:
+        value (str): Header value, either seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _never_sent(error):
+    """
+    Check whether a request error happened before anything was sent
+
+    requests.ConnectionError also covers connections dropped after the
+    body went out, so only a connect timeout or a failure to open the
+    connection (including name resolution) counts.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError):
+        return False
+    reason = error.args[0] if error.args else None
+    # requests wraps urllib3's MaxRetryError, whose reason is the real error
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
+def _request_for(op):
+    """Map a WriteOp to (method, path, json payload)"""
+    if op.action == "create":
+        return "POST", "posts", op.data
+    if op.action == "update":
+        return "PUT", f"posts/{op.post_id}", op.data
+    if op.action == "patch":
+        return "PATCH", f"posts/{op.post_id}", op.data
+    if op.action == "delete":
+        return "DELETE", f"posts/{op.post_id}", None
+    raise ValueError(f"Unknown write action: {op.action}")
+
+
+def _execute(client, op, limiter, max_attempts, backoff):
+    """Run one write with retries, returning its WriteResult"""
+    try:
+        method, path, payload = _request_for(op)
+    except ValueError as e:
+        return WriteResult(op, False, None, None, e, 0)
+
+    # A create that may have reached the server is not sent again
+    idempotent = op.action != "create"
+    status = None
+    error = None
+    for attempt in range(1, max_attempts + 1):
+        limiter.acquire()
+        retry_after = None
+        try:
+            response = client.request(method, path, json=payload)
+        except requests.RequestException as e:
+            limiter.release(throttled=True)
+            status, error = None, e
+            if not idempotent and not _never_sent(e):
+                return WriteResult(op, False, None, None, e, attempt)
+        except Exception as e:
+            # E.g. a payload that cannot be encoded as JSON; retrying will not help
+            limiter.release()
+            return WriteResult(op, False, None, None, e, attempt)
+        else:
+            status = response.status_code
+            if status in RETRY_STATUSES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                limiter.release(throttled=True, retry_after=retry_after)
+                error = requests.HTTPError(f"{status} Error for {method} {path}", response=response)
+                if not idempotent and status not in UNPROCESSED_STATUSES:
+                    return WriteResult(op, False, status, None, error, attempt)
+            else:
+                limiter.release()
+                if not response.ok:
+                    # Client errors will not succeed on retry
+                    error = requests.HTTPError(f"{status} Error for {method} {path}", response=response)
+                    return WriteResult(op, False, status, None, error, attempt)
+
+                client.invalidate(path)
+                client.invalidate("posts")
+                try:
+                    data = response.json() if response.content else None
+                except ValueError:
+                    data = None
+                return WriteResult(op, True, status, data, None, attempt)
+
+        if attempt < max_attempts and retry_after is None:
+            # Retry-After pauses the limiter instead; otherwise back off exponentially
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+    return WriteResult(op, False, status, None, error, max_attempts)
+
+
+def run_writes(operations, client=None, max_workers=32, initial_concurrency=4,
+               max_attempts=5, backoff=0.5):
+    """
+    Run many post writes on a worker pool with adaptive concurrency
+
+    Requests in flight grow while the server keeps up and shrink on 429
+    and 5xx responses, honoring Retry-After. Operations are consumed
+    lazily, so the iterable can be a generator over a large input.
+
+    Args:
+        operations (iterable): WriteOp objects to run
+        client (ApiClient, optional): Client to use (default: the shared client);
+            its pool_maxsize should be at least max_workers
+        max_workers (int): Worker threads, also the highest concurrency allowed
+        initial_concurrency (int): Requests in flight at the start
+        max_attempts (int): Attempts per operation before giving up
+        backoff (float): Base delay in seconds for exponential backoff
+
+    Returns:
+        list: WriteResult for each operation, in input order
+    """
+    client = client or get_default_client()
+    limiter = AdaptiveLimiter(initial=min(initial_concurrency, max_workers), maximum=max_workers)
+
+    # Bound the number of queued operations so the input is not read all at once
+    pending = threading.BoundedSemaphore(max_workers * 2)
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for op in operations:
+            pending.acquire()
+            future = executor.submit(_execute, client, op, limiter, max_attempts, backoff)
+            future.add_done_callback(lambda _: pending.release())
+            futures.append(future)
+
+    return [future.result() for future in futures]
+
+
+def summarize_writes(results):
+    """
+    Summarize a write report
+
+    Args:
+        results (list): WriteResult objects returned by run_writes
+
+    Returns:
+        dict: Counts of succeeded/failed operations, retries and statuses
+    """
+    statuses = Counter(result.status for result in results)
+    return {
+        "total": len(results),
+        "succeeded": sum(1 for result in results if result.ok),
+        "failed": sum(1 for result in results if not result.ok),
+        "retried": sum(1 for result in results if result.attempts > 1),
+        "statuses": dict(statuses)
+    }
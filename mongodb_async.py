@@ -0,0 +1,180 @@
+import asyncio
+
+try:
+    from pymongo import AsyncMongoClient
+except ImportError:
+    # pymongo < 4.9 has no native asyncio client
+    AsyncMongoClient = None
+
+from mongodb_operations import DEFAULT_CLIENT_OPTIONS, connection_string_from_environment
+
+
+class AsyncMongoDBClient:
+    """asyncio counterpart of MongoDBClient"""
+
+    def __init__(self, connection_string=None, database="nz-events", **client_options):
+        """
+        Initialize MongoDB connection using environment variables
+
+        The client belongs to the event loop it is first used on and
+        connects lazily on the first operation.
+
+        Args:
+            connection_string (str, optional): MongoDB URI (default: MONGODB_URI)
+            database (str): Database name
+            **client_options: Pool and timeout settings overriding DEFAULT_CLIENT_OPTIONS
+        """
+        if AsyncMongoClient is None:
+            raise ImportError("AsyncMongoDBClient needs pymongo 4.9 or newer")
+
+        self.connection_string = connection_string or connection_string_from_environment()
+        if not self.connection_string:
+            raise ValueError("MongoDB connection string not found in environment variables")
+
+        options = dict(DEFAULT_CLIENT_OPTIONS, **client_options)
+        self.client = AsyncMongoClient(self.connection_string, connect=False, **options)
+        self.db = self.client.get_database(database)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close_connection()
+
+    async def list_collections(self):
+        """List all collections in the database"""
+        try:
+            return await self.db.list_collection_names()
+        except Exception as e:
+            print(f"Error listing collections: {e}")
+            return []
+
+    def _find(self, collection_name, filter_dict=None, projection=None, batch_size=1000,
+              limit=0, sort=None):
+        """Build a cursor for iter_documents and the fetch methods"""
+        cursor = self.db[collection_name].find(
+            filter_dict or {},
+            projection,
+            batch_size=batch_size,
+            limit=limit
+        )
+        if sort:
+            cursor = cursor.sort(sort)
+        return cursor
+
+    async def iter_documents(self, collection_name, filter_dict=None, projection=None,
+                             batch_size=1000, limit=0, sort=None):
+        """
+        Iterate over documents straight from the server cursor
+
+        Args:
+            collection_name (str): Name of the collection
+            filter_dict (dict, optional): Filter criteria (default: all documents)
+            projection (dict or list, optional): Fields to return
+            batch_size (int): Documents per server round trip
+            limit (int): Maximum number of documents (0: no limit)
+            sort (str or list, optional): Sort key, or list of (key, direction) pairs
+
+        Yields:
+            dict: Each matching document
+        """
+        try:
+            cursor = self._find(collection_name, filter_dict, projection, batch_size, limit, sort)
+            async with cursor:
+                async for document in cursor:
+                    yield document
+        except Exception as e:
+            print(f"Error iterating documents from {collection_name}: {e}")
+
+    async def fetch_all_documents(self, collection_name, projection=None, batch_size=1000):
+        """
+        Fetch all documents from a specific collection
+
+        Args:
+            collection_name (str): Name of the collection
+            projection (dict or list, optional): Fields to return
+            batch_size (int): Documents per server round trip
+        """
+        try:
+            return await self._find(collection_name, None, projection, batch_size).to_list()
+        except Exception as e:
+            print(f"Error fetching documents from {collection_name}: {e}")
+            return []
+
+    async def fetch_documents_with_filter(self, collection_name, filter_dict, projection=None,
+                                          batch_size=1000, sort=None):
+        """
+        Fetch documents that match specific criteria
+
+        Args:
+            collection_name (str): Name of the collection
+            filter_dict (dict): Filter criteria
+            projection (dict or list, optional): Fields to return
+            batch_size (int): Documents per server round trip
+            sort (str or list, optional): Sort key, or list of (key, direction) pairs
+        """
+        try:
+            cursor = self._find(collection_name, filter_dict, projection, batch_size, sort=sort)
+            return await cursor.to_list()
+        except Exception as e:
+            print(f"Error fetching filtered documents from {collection_name}: {e}")
+            return []
+
+    async def fetch_from_collections(self, queries, projection=None, concurrency=None):
+        """
+        Query several collections concurrently on this event loop
+
+        Args:
+            queries (dict): Collection name -> filter dict (None: all documents)
+            projection (dict or list, optional): Fields to return from every collection
+            concurrency (int, optional): Maximum queries in flight (default: all at once)
+
+        Returns:
+            dict: Collection name -> list of documents
+        """
+        semaphore = asyncio.Semaphore(concurrency or max(1, len(queries)))
+
+        async def fetch(collection_name, filter_dict):
+            async with semaphore:
+                return await self.fetch_documents_with_filter(
+                    collection_name, filter_dict or {}, projection
+                )
+
+        results = await asyncio.gather(
+            *(fetch(name, filter_dict) for name, filter_dict in queries.items())
+        )
+        return dict(zip(queries, results))
+
+    async def close_connection(self):
+        """Close the MongoDB connection"""
+        try:
+            await self.client.close()
+        except Exception as e:
+            print(f"Error closing connection: {e}")
+
+
+async def _main():
+    async with AsyncMongoDBClient() as mongo_client:
+        collections = await mongo_client.list_collections()
+        print("\nAvailable collections:")
+        for collection in collections:
+            print(f"- {collection}")
+
+        # Ask for every collection's size concurrently
+        counts = await asyncio.gather(
+            *(mongo_client.db[name].estimated_document_count() for name in collections)
+        )
+        print("\nEstimated documents per collection:")
+        for name, count in zip(collections, counts):
+            print(f"- {name}: {count}")
+
+
+def main():
+    try:
+        asyncio.run(_main())
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+
+if __name__ == "__main__":
+    main()
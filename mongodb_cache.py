@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import OrderedDict
+
+from bson import json_util
+
+
+def query_key(collection_name, filter_dict=None, projection=None, sort=None):
+    """
+    Build a cache key for a query
+
+    Top-level filter fields are ANDed, so their order does not matter and
+    they are sorted; nested values keep their order because MongoDB
+    compares embedded documents field by field.
+
+    Args:
+        collection_name (str): Name of the collection
+        filter_dict (dict, optional): Filter criteria
+        projection (dict or list, optional): Fields returned
+        sort (str or list, optional): Sort specification
+
+    Returns:
+        tuple: (collection name, canonical query text)
+    """
+    filter_items = sorted((filter_dict or {}).items())
+    if isinstance(projection, (list, tuple)):
+        projection = sorted(projection)
+    return collection_name, json_util.dumps([filter_items, projection, sort])
+
+
+class QueryCache:
+    """
+    LRU cache of query results with TTL and per-collection invalidation
+
+    Results are invalidated for a whole collection whenever a write to it
+    is seen, either through invalidate() or through a change stream
+    started with watch(). Cached documents are shared between callers and
+    must not be modified.
+    """
+
+    def __init__(self, max_entries=128, max_documents=100000, ttl=300):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of cached queries
+            max_documents (int): Maximum documents held across all entries
+            ttl (float, optional): Seconds a result stays valid (None: until invalidated)
+        """
+        self.max_entries = max_entries
+        self.max_documents = max_documents
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._documents = 0
+        self._generations = {}
+        self._lock = threading.Lock()
+        self._watch_thread = None
+        self._watch_stream = None
+
+    def generation(self, collection_name):
+        """
+        Return the invalidation counter of a collection
+
+        Read it before running a query and pass it to put(), so a result
+        that raced with a write is not stored.
+
+        Args:
+            collection_name (str): Name of the collection
+
+        Returns:
+            int: Current generation
+        """
+        with self._lock:
+            return self._generations.get(collection_name, 0)
+
+    def get(self, key):
+        """
+        Return a cached result
+
+        Args:
+            key (tuple): Key from query_key()
+
+        Returns:
+            list: Cached documents, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[1] >= self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[0])
+
+    def put(self, key, documents, generation=None):
+        """
+        Store a query result
+
+        Args:
+            key (tuple): Key from query_key()
+            documents (list): Query result
+            generation (int, optional): Collection generation read before the query
+        """
+        if len(documents) > self.max_documents:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generations.get(key[0], 0):
+                # The collection changed while the query ran
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (list(documents), time.time())
+            self._documents += len(documents)
+            while len(self._entries) > self.max_entries or self._documents > self.max_documents:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        documents, _ = self._entries.pop(key)
+        self._documents -= len(documents)
+
+    def invalidate(self, collection_name=None):
+        """
+        Drop cached results after a write
+
+        Args:
+            collection_name (str, optional): Collection written to (default: all)
+        """
+        with self._lock:
+            keys = [key for key in self._entries if collection_name in (None, key[0])]
+            for key in keys:
+                self._remove(key)
+            if collection_name is None:
+                for name in self._generations:
+                    self._generations[name] += 1
+            else:
+                self._generations[collection_name] = self._generations.get(collection_name, 0) + 1
+            self.invalidations += 1
+
+    def stats(self):
+        """
+        Return cache counters
+
+        Returns:
+            dict: Hits, misses, evictions, invalidations and current size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "documents": self._documents,
+                "watching": self.watching
+            }
+
+    @property
+    def watching(self):
+        """True while a change stream is invalidating the cache"""
+        return self._watch_thread is not None and self._watch_thread.is_alive()
+
+    def watch(self, db):
+        """
+        Invalidate collections as a change stream reports writes to them
+
+        Change streams need a replica set or sharded cluster; on a
+        standalone server the watcher stops with a message and invalidate()
+        must be called explicitly instead.
+
+        Args:
+            db (Database): Database to watch
+        """
+        if self.watching:
+            return
+
+        def run():
+            try:
+                with db.watch() as stream:
+                    self._watch_stream = stream
+                    # Anything written before the stream opened may already be cached
+                    self.invalidate()
+                    for change in stream:
+                        collection_name = change.get("ns", {}).get("coll")
+                        self.invalidate(collection_name)
+            except Exception as e:
+                if self._watch_stream is not None and not self._watch_stream.alive:
+                    return
+                print(f"Change stream stopped, cache needs explicit invalidation: {e}")
+                self.invalidate()
+            finally:
+                self._watch_stream = None
+
+        self._watch_thread = threading.Thread(target=run, daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        """Close the change stream started by watch()"""
+        stream = self._watch_stream
+        if stream is not None:
+            stream.close()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=5)
+            self._watch_thread = None
@@ -1,100 +1,1225 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
+import bson
+from bson import json_util
 from dotenv import load_dotenv
+import ast
+import base64
 import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-# Load environment variables
-load_dotenv()
+from mongodb_cache import query_key
+from mongodb_profiler import QueryProfiler
+from renderer import render_records
 
+# Documents shown per page when browsing a collection
+PAGE_SIZE = 20
 
-def display_documents(documents):
+# Connection pool settings used unless overridden per client
+DEFAULT_CLIENT_OPTIONS = {
+    "maxPoolSize": 100,
+    "minPoolSize": 0,
+    "maxIdleTimeMS": 300000,
+    "connectTimeoutMS": 5000,
+    "serverSelectionTimeoutMS": 10000
+}
+
+# Seconds the collection catalog is reused before it is refreshed
+CATALOG_TTL = 300
+
+# Collections with more documents than this are flagged before streaming them
+LARGE_COLLECTION_DOCUMENTS = 100000
+
+# Catalog entry for one collection; sizes are in bytes
+CollectionInfo = namedtuple("CollectionInfo", ["name", "count", "size", "storage_size", "indexes"])
+
+# Accumulators understood by MongoDBClient.group_by ("count" takes no field)
+ACCUMULATORS = {"sum", "avg", "min", "max", "first", "last", "push", "addToSet", "count"}
+
+# Limits for one bulk_write batch
+BULK_BATCH_SIZE = 1000
+BULK_BATCH_BYTES = 8 * 1024 * 1024
+
+# Assumed BSON size of a ready-made pymongo write model, whose contents are private
+WRITE_MODEL_SIZE_ESTIMATE = 1024
+
+# Shared MongoClient instances keyed by connection string and options
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+_environment_loaded = False
+
+
+def connection_string_from_environment():
+    """Return MONGODB_URI, loading the .env file on first need"""
+    global _environment_loaded
+    if not os.getenv('MONGODB_URI') and not _environment_loaded:
+        # Load environment variables
+        load_dotenv()
+        _environment_loaded = True
+    return os.getenv('MONGODB_URI')
+
+
+def get_shared_client(connection_string, **options):
+    """
+    Return the process-wide MongoClient for a connection string and options
+
+    Clients are created with connect=False, so no connection is opened
+    until the first operation. Every caller asking for the same settings
+    shares one client and therefore one connection pool.
+
+    Args:
+        connection_string (str): MongoDB connection URI
+        **options: MongoClient options (maxPoolSize, minPoolSize, maxIdleTimeMS,
+            connectTimeoutMS, socketTimeoutMS, serverSelectionTimeoutMS,
+            compressors, ...) overriding DEFAULT_CLIENT_OPTIONS
+
+    Returns:
+        MongoClient: The shared client
+    """
+    options = dict(DEFAULT_CLIENT_OPTIONS, **options)
+    key = (connection_string, repr(sorted(options.items())))
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = MongoClient(connection_string, connect=False, **options)
+        return client
+
+
+def close_shared_clients():
+    """Close every shared MongoClient and forget them"""
+    with _shared_clients_lock:
+        clients = list(_shared_clients.values())
+        _shared_clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"Error closing connection: {e}")
+
+
+def _get_field(doc, key):
+    """Read a possibly dotted field path such as "venue.city" from a document"""
+    for part in key.split("."):
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(part)
+    return doc
+
+
+def encode_page_token(sort_key, direction, last_value, last_id):
+    """
+    Encode the position after a page as an opaque continuation token
+
+    Args:
+        sort_key (str): Field the pages are sorted on
+        direction (int): ASCENDING or DESCENDING
+        last_value: Sort key value of the last document on the page
+        last_id: _id of the last document on the page
+
+    Returns:
+        str: URL-safe token
+    """
+    state = {"key": sort_key, "dir": direction, "value": last_value, "id": last_id}
+    return base64.urlsafe_b64encode(json_util.dumps(state).encode()).decode()
+
+
+def decode_page_token(token):
+    """
+    Decode a continuation token from encode_page_token
+
+    Args:
+        token (str): Token to decode
+
+    Returns:
+        dict: key, dir, value and id of the last document seen
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        return json_util.loads(base64.urlsafe_b64decode(token.encode()))
+    except Exception as e:
+        raise ValueError(f"Invalid page token: {e}") from None
+
+
+def _format_document(doc):
+    """Human-readable text for a document"""
+    lines = ["\n" + "="*50]
+    for key, value in doc.items():
+        if key == '_id':
+            lines.append(f"ID: {value}")
+        else:
+            # Format datetime objects
+            if isinstance(value, datetime):
+                value = value.strftime("%Y-%m-%d %H:%M:%S")
+            lines.append(f"{key}: {value}")
+    return "\n".join(lines) + "\n"
+
+
+def display_documents(documents, fmt="human", stream=None, fields=None):
     """
     Display documents in a formatted way
 
+    Output is buffered and starts with the first document, so a cursor
+    or generator is displayed while it is being read. Documents often
+    have different fields, so CSV output without fields reads every
+    document first and uses all the fields that appear.
+
     Args:
-        documents (list): List of documents to display
+        documents (iterable): Documents to display, e.g. a list or a cursor
+        fmt (str): Output format: "human", "jsonl" or "csv"
+        stream (file, optional): Where to write (default: stdout)
+        fields (list, optional): CSV columns
     """
-    if not documents:
-        print("No documents found")
-        return
+    if fmt == "csv" and fields is None:
+        documents = list(documents or ())
+        # dict keeps the order in which fields first appear
+        fields = list(dict.fromkeys(key for document in documents for key in document))
+    render_records(
+        documents,
+        _format_document,
+        fmt=fmt,
+        stream=stream,
+        empty_message="No documents found\n",
+        fields=fields or None
+    )
+
+
+def to_write_model(operation):
+    """
+    Turn a write operation into a pymongo write model
+
+    Operations are either pymongo models (InsertOne, UpdateOne, ...) or
+    dicts with an "op" key:
+        {"op": "insert", "document": {...}}
+        {"op": "upsert", "filter": {...}, "document": {...}}   (replace or insert)
+        {"op": "update", "filter": {...}, "update": {...}, "upsert": False, "many": False}
+        {"op": "delete", "filter": {...}, "many": False}
+
+    Args:
+        operation (dict or write model): Operation to convert
+
+    Returns:
+        tuple: (write model, approximate BSON size in bytes)
+
+    Raises:
+        ValueError: If the operation is not understood or is missing a key
+        bson.errors.InvalidDocument: If a document cannot be encoded
+    """
+    if not isinstance(operation, dict):
+        if isinstance(operation, (InsertOne, ReplaceOne, UpdateOne, UpdateMany, DeleteOne, DeleteMany)):
+            # A rough size is enough for batching; pymongo splits oversized batches itself
+            return operation, WRITE_MODEL_SIZE_ESTIMATE
+        raise ValueError(f"Unsupported write operation: {operation!r}")
+
+    try:
+        return _dict_write_model(operation)
+    except KeyError as e:
+        raise ValueError(f"Write operation {operation.get('op')!r} is missing {e}") from None
+
+
+def _dict_write_model(operation):
+    """Convert a dict operation for to_write_model"""
+    kind = operation.get("op")
+    if kind == "insert":
+        document = operation["document"]
+        return InsertOne(document), len(bson.encode(document))
+    if kind == "upsert":
+        document = operation["document"]
+        model = ReplaceOne(operation["filter"], document, upsert=True)
+        return model, len(bson.encode(operation["filter"])) + len(bson.encode(document))
+    if kind == "update":
+        model_class = UpdateMany if operation.get("many") else UpdateOne
+        update = operation["update"]
+        model = model_class(operation["filter"], update, upsert=operation.get("upsert", False))
+        update_size = len(bson.encode(update)) if isinstance(update, dict) else len(json_util.dumps(update))
+        return model, len(bson.encode(operation["filter"])) + update_size
+    if kind == "delete":
+        model_class = DeleteMany if operation.get("many") else DeleteOne
+        return model_class(operation["filter"]), len(bson.encode(operation["filter"]))
+    raise ValueError(f"Unknown write operation: {kind!r}")
+
+
+def _write_batches(operations, batch_size, max_batch_bytes, errors, ordered=False):
+    """
+    Group operations into batches bounded by count and bytes
+
+    Operations that cannot be converted are reported in errors and left
+    out; when ordered, the batch before them is yielded and nothing after.
+
+    Yields:
+        tuple: (indexes into operations, write models)
+    """
+    batch = []
+    indexes = []
+    batch_bytes = 0
+    for index, operation in enumerate(operations):
+        try:
+            model, size = to_write_model(operation)
+        except (ValueError, TypeError, bson.errors.InvalidDocument) as e:
+            errors.append({"index": index, "code": None, "message": str(e)})
+            if ordered:
+                break
+            continue
+        if batch and (len(batch) >= batch_size or batch_bytes + size > max_batch_bytes):
+            yield indexes, batch
+            batch, indexes, batch_bytes = [], [], 0
+        batch.append(model)
+        indexes.append(index)
+        batch_bytes += size
+    if batch:
+        yield indexes, batch
+
+
+def parse_filter(text):
+    """
+    Safely parse a filter typed by a user
+
+    Accepts MongoDB Extended JSON (e.g. {"_id": {"$oid": "..."}}) and
+    Python-style literals (e.g. {'field': 'value'}); nothing is executed.
+
+    Args:
+        text (str): Filter text
+
+    Returns:
+        dict: Parsed filter (empty for blank input)
+
+    Raises:
+        ValueError: If the text is not a document
+    """
+    text = text.strip()
+    if not text:
+        return {}
+    try:
+        filter_dict = json_util.loads(text)
+    except (TypeError, KeyError, RecursionError, MemoryError) as e:
+        # Malformed Extended JSON (e.g. {"$oid": 1}) or absurdly nested input
+        raise ValueError(f"Filter is not valid JSON: {e}") from None
+    except ValueError:
+        try:
+            filter_dict = ast.literal_eval(text)
+        except (ValueError, SyntaxError, TypeError, RecursionError, MemoryError) as e:
+            # TypeError: e.g. an unhashable key; the others: absurdly nested input
+            raise ValueError(f"Filter is neither JSON nor a literal: {e}") from None
+    if not isinstance(filter_dict, dict):
+        raise ValueError("Filter must be a document, e.g. {\"field\": \"value\"}")
+    return filter_dict
 
-    for doc in documents:
-        print("\n" + "="*50)
-        for key, value in doc.items():
-            if key == '_id':
-                print(f"ID: {value}")
-            else:
-                # Format datetime objects
-                if isinstance(value, datetime):
-                    value = value.strftime("%Y-%m-%d %H:%M:%S")
-                print(f"{key}: {value}")
+
+def format_bytes(size):
+    """Format a byte count for display, e.g. 1536 -> 1.5 KB"""
+    if size is None:
+        return "?"
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def _accumulator(spec):
+    """Turn ("sum", "price"), ("count", None) or a raw expression into an accumulator"""
+    if isinstance(spec, dict):
+        return spec
+    operator, field = spec
+    if operator not in ACCUMULATORS:
+        raise ValueError(f"Unknown accumulator: {operator}")
+    if operator == "count":
+        return {"$sum": 1}
+    return {f"${operator}": f"${field}"}
+
+
+def _group_key(keys):
+    """Build a $group _id from one field name or a list of them"""
+    if isinstance(keys, str):
+        return f"${keys}"
+    # Dots are not allowed in field names of the _id document
+    return {key.replace(".", "_"): f"${key}" for key in keys}
 
 
 class MongoDBClient:
     """Class to handle MongoDB operations"""
     
-    def __init__(self):
-        """Initialize MongoDB connection using environment variables"""
+    def __init__(self, connection_string=None, database="nz-events", shared=True,
+                 warm_up=False, query_cache=None, **client_options):
+        """
+        Initialize MongoDB connection using environment variables
+
+        No network I/O happens here: the connection is made lazily on the
+        first operation (or by warm_up). By default the MongoClient comes
+        from the process-wide registry, so creating many MongoDBClient
+        objects does not create many connection pools.
+
+        Args:
+            connection_string (str, optional): MongoDB URI (default: MONGODB_URI)
+            database (str): Database name
+            shared (bool): Use the shared client instead of a private one
+            warm_up (bool): Open connections right away instead of on first use
+            query_cache (QueryCache, optional): Cache for fetch_documents_with_filter
+                results (see mongodb_cache)
+            **client_options: Pool and timeout settings, see get_shared_client
+        """
         # Use environment variable for the connection string
-        self.connection_string = os.getenv('MONGODB_URI')
+        self.connection_string = connection_string or connection_string_from_environment()
         if not self.connection_string:
             raise ValueError("MongoDB connection string not found in environment variables")
         
+        self.shared = shared
+        self.query_cache = query_cache
+        self.profiler = None
+        self._catalog = None
+        self._catalog_loaded_at = 0.0
+        self._catalog_lock = threading.Lock()
         try:
-            self.client = MongoClient(self.connection_string)
-            self.db = self.client.get_database("nz-events")  # Replace with your database name
+            if shared:
+                self.client = get_shared_client(self.connection_string, **client_options)
+            else:
+                options = dict(DEFAULT_CLIENT_OPTIONS, **client_options)
+                self.client = MongoClient(self.connection_string, connect=False, **options)
+            self.db = self.client.get_database(database)
         except Exception as e:
             print(f"Error connecting to MongoDB: {e}")
             raise
+
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self, connections=1):
+        """
+        Open pooled connections ahead of the first real query
+
+        Args:
+            connections (int): Number of connections to open concurrently
+
+        Returns:
+            bool: True if the server answered
+        """
+        def ping():
+            self.client.admin.command("ping")
+
+        try:
+            with ThreadPoolExecutor(max_workers=connections) as executor:
+                for future in [executor.submit(ping) for _ in range(connections)]:
+                    future.result()
+            return True
+        except Exception as e:
+            print(f"Error connecting to MongoDB: {e}")
+            return False
+    
+    def enable_profiling(self, explain=True, examined_ratio=10):
+        """
+        Start recording query shapes and explaining new ones
+
+        Args:
+            explain (bool): Run explain() on each new query shape
+            examined_ratio (float): docsExamined / nReturned above which a
+                query is reported as needing an index
+
+        Returns:
+            QueryProfiler: The profiler; see its report() and
+                create_recommended_indexes()
+        """
+        if self.profiler is None:
+            self.profiler = QueryProfiler(self.db, explain, examined_ratio)
+        return self.profiler
+
+    def disable_profiling(self):
+        """Stop recording queries"""
+        self.profiler = None
+
+    def list_collections(self, refresh=False):
+        """
+        List all collections in the database
+
+        Names come from the collection catalog, so repeated calls within
+        CATALOG_TTL do not hit the server.
+
+        Args:
+            refresh (bool): Reload the catalog first
+        """
+        return [info.name for info in self.collection_catalog(refresh)]
+
+    def _collection_info(self, name):
+        """Read count, sizes and index names of one collection"""
+        collection = self.db[name]
+        try:
+            stats = next(collection.aggregate([{"$collStats": {"storageStats": {}}}]))
+            storage = stats["storageStats"]
+            return CollectionInfo(
+                name,
+                storage.get("count"),
+                storage.get("size"),
+                storage.get("storageSize"),
+                sorted(storage.get("indexSizes", {}))
+            )
+        except Exception:
+            # $collStats needs extra privileges; fall back to cheaper metadata
+            pass
+        try:
+            count = collection.estimated_document_count()
+        except Exception:
+            count = None
+        try:
+            indexes = sorted(collection.index_information())
+        except Exception:
+            indexes = []
+        return CollectionInfo(name, count, None, None, indexes)
+
+    def collection_catalog(self, refresh=False):
+        """
+        Return names, document counts, sizes and indexes of every collection
+
+        The catalog is cached for CATALOG_TTL seconds; counts are the
+        server's estimates, read from collection metadata.
+
+        Args:
+            refresh (bool): Reload from the server even if the cache is fresh
+
+        Returns:
+            list: CollectionInfo for each collection, sorted by name
+        """
+        with self._catalog_lock:
+            fresh = time.monotonic() - self._catalog_loaded_at < CATALOG_TTL
+            if self._catalog is not None and fresh and not refresh:
+                return self._catalog
+            try:
+                names = sorted(self.db.list_collection_names())
+            except Exception as e:
+                print(f"Error listing collections: {e}")
+                return self._catalog or []
+            self._catalog = [self._collection_info(name) for name in names]
+            self._catalog_loaded_at = time.monotonic()
+            return self._catalog
+
+    def refresh_catalog(self):
+        """Reload the collection catalog from the server"""
+        return self.collection_catalog(refresh=True)
+
+    def is_large_collection(self, collection_name):
+        """
+        Check whether a collection is too big to stream casually
+
+        Args:
+            collection_name (str): Name of the collection
+
+        Returns:
+            bool: True if its estimated count exceeds LARGE_COLLECTION_DOCUMENTS
+        """
+        for info in self.collection_catalog():
+            if info.name == collection_name:
+                return (info.count or 0) > LARGE_COLLECTION_DOCUMENTS
+        return False
     
-    def list_collections(self):
-        """List all collections in the database"""
+    def _find(self, collection_name, filter_dict=None, projection=None, batch_size=1000,
+              limit=0, sort=None):
+        """Build a cursor for iter_documents and the fetch methods"""
+        if self.profiler is not None:
+            self.profiler.record(collection_name, filter_dict, projection, sort, limit)
+        collection = self.db[collection_name]
+        cursor = collection.find(
+            filter_dict or {},
+            projection,
+            batch_size=batch_size,
+            limit=limit
+        )
+        if sort:
+            cursor = cursor.sort(sort)
+        return cursor
+
+    def iter_documents(self, collection_name, filter_dict=None, projection=None, batch_size=1000,
+                       limit=0, sort=None):
+        """
+        Iterate over documents straight from the server cursor
+
+        Documents are fetched from the server batch_size at a time, so
+        memory stays bounded and the first document is available as soon
+        as the first batch arrives.
+
+        Args:
+            collection_name (str): Name of the collection
+            filter_dict (dict, optional): Filter criteria (default: all documents)
+            projection (dict or list, optional): Fields to return
+            batch_size (int): Documents per server round trip
+            limit (int): Maximum number of documents (0: no limit)
+            sort (str or list, optional): Sort key, or list of (key, direction) pairs
+
+        Yields:
+            dict: Each matching document
+        """
         try:
-            collections = self.db.list_collection_names()
-            return collections
+            cursor = self._find(collection_name, filter_dict, projection, batch_size, limit, sort)
+            with cursor:
+                yield from cursor
         except Exception as e:
-            print(f"Error listing collections: {e}")
+            print(f"Error iterating documents from {collection_name}: {e}")
+
+    def fetch_page(self, collection_name, filter_dict=None, page_size=PAGE_SIZE, sort_key="_id",
+                   direction=ASCENDING, token=None, projection=None):
+        """
+        Fetch one page of documents using keyset pagination
+
+        Instead of skipping over earlier pages, each page starts right
+        after the last (sort key, _id) seen, so with an index on the sort
+        key every page costs the same as the first. The sort key should
+        be present in every document.
+
+        Args:
+            collection_name (str): Name of the collection
+            filter_dict (dict, optional): Filter criteria (default: all documents)
+            page_size (int): Documents per page
+            sort_key (str): Indexed field to page on (default: _id)
+            direction (int): ASCENDING or DESCENDING
+            token (str, optional): Continuation token from the previous page
+            projection (dict or list, optional): Fields to return
+
+        Returns:
+            tuple: (list of documents, token for the next page or None on the last page)
+        """
+        criteria = [filter_dict] if filter_dict else []
+        if token:
+            state = decode_page_token(token)
+            if state["key"] != sort_key or state["dir"] != direction:
+                raise ValueError("Page token was created for a different sort order")
+            after = "$gt" if direction == ASCENDING else "$lt"
+            if sort_key == "_id":
+                criteria.append({"_id": {after: state["id"]}})
+            else:
+                # Ties on the sort key are broken by _id
+                criteria.append({"$or": [
+                    {sort_key: {after: state["value"]}},
+                    {sort_key: state["value"], "_id": {after: state["id"]}}
+                ]})
+
+        if not criteria:
+            query = {}
+        elif len(criteria) == 1:
+            query = criteria[0]
+        else:
+            query = {"$and": criteria}
+
+        sort = [(sort_key, direction)]
+        if sort_key != "_id":
+            sort.append(("_id", direction))
+        if isinstance(projection, dict) and any(projection.values()):
+            projection = dict(projection, **{sort_key: 1})
+        elif isinstance(projection, (list, tuple)):
+            projection = list(projection) + [sort_key]
+
+        try:
+            # Read one extra document to learn whether another page follows
+            documents = list(self._find(
+                collection_name, query, projection, page_size + 1, page_size + 1, sort
+            ))
+        except Exception as e:
+            print(f"Error fetching page from {collection_name}: {e}")
+            return [], None
+
+        if len(documents) <= page_size:
+            return documents, None
+        documents = documents[:page_size]
+        last = documents[-1]
+        return documents, encode_page_token(sort_key, direction, _get_field(last, sort_key), last["_id"])
+
+    def iter_pages(self, collection_name, filter_dict=None, page_size=PAGE_SIZE, sort_key="_id",
+                   direction=ASCENDING, token=None, projection=None):
+        """
+        Iterate over a collection page by page, resuming from a token
+
+        Args:
+            collection_name (str): Name of the collection
+            filter_dict (dict, optional): Filter criteria (default: all documents)
+            page_size (int): Documents per page
+            sort_key (str): Indexed field to page on (default: _id)
+            direction (int): ASCENDING or DESCENDING
+            token (str, optional): Continuation token to resume from
+            projection (dict or list, optional): Fields to return
+
+        Yields:
+            tuple: (list of documents, token for the next page or None on the last page)
+        """
+        while True:
+            documents, token = self.fetch_page(
+                collection_name, filter_dict, page_size, sort_key, direction, token, projection
+            )
+            if documents:
+                yield documents, token
+            if not token:
+                return
+
+    def partition_boundaries(self, collection_name, partitions, filter_dict=None,
+                             sample_size=None, use_split_vector=False):
+        """
+        Pick _id values that split a collection into roughly equal ranges
+
+        Boundaries come from a random $sample of _ids, or from the
+        splitVector command when asked for and permitted (it needs
+        cluster privileges; sampling is used if it fails).
+
+        Args:
+            collection_name (str): Name of the collection
+            partitions (int): Number of ranges wanted
+            filter_dict (dict, optional): Only sample documents matching this filter
+            sample_size (int, optional): _ids to sample (default: 100 per partition)
+            use_split_vector (bool): Try splitVector before sampling
+
+        Returns:
+            list: Sorted boundary _ids (at most partitions - 1)
+        """
+        if partitions <= 1:
             return []
-    
-    def fetch_all_documents(self, collection_name):
+
+        if use_split_vector and not filter_dict:
+            try:
+                size = self.db.command("collStats", collection_name)["size"]
+                result = self.db.command(
+                    "splitVector",
+                    f"{self.db.name}.{collection_name}",
+                    keyPattern={"_id": 1},
+                    maxChunkSizeBytes=max(1, size // partitions)
+                )
+                return [split["_id"] for split in result["splitKeys"]][:partitions - 1]
+            except Exception as e:
+                print(f"splitVector unavailable, sampling instead: {e}")
+
+        sample_size = sample_size or partitions * 100
+        pipeline = [{"$match": filter_dict}] if filter_dict else []
+        pipeline += [{"$sample": {"size": sample_size}}, {"$project": {"_id": 1}}]
+        ids = sorted({doc["_id"] for doc in self.db[collection_name].aggregate(pipeline)})
+        if len(ids) < partitions:
+            return ids[1:]
+        step = len(ids) / partitions
+        return [ids[int(step * i)] for i in range(1, partitions)]
+
+    def _range_filter(self, filter_dict, lower, upper):
+        """Restrict a filter to lower <= _id < upper (either bound may be None)"""
+        id_range = {}
+        if lower is not None:
+            id_range["$gte"] = lower
+        if upper is not None:
+            id_range["$lt"] = upper
+        if not id_range:
+            return filter_dict or {}
+        if not filter_dict:
+            return {"_id": id_range}
+        return {"$and": [filter_dict, {"_id": id_range}]}
+
+    def parallel_scan(self, collection_name, filter_dict=None, projection=None, partitions=None,
+                      workers=None, batch_size=1000, callback=None, max_buffered_batches=16,
+                      use_split_vector=False):
+        """
+        Scan a collection concurrently, one cursor per _id range
+
+        The collection is split into _id ranges that are read on a thread
+        pool sharing this client's connection pool. Without a callback
+        the documents are yielded as one unordered stream; with a
+        callback each partition's documents are handed to it instead and
+        the callback results are returned in partition order.
+
+        Args:
+            collection_name (str): Name of the collection
+            filter_dict (dict, optional): Filter criteria (default: all documents)
+            projection (dict or list, optional): Fields to return
+            partitions (int, optional): Number of _id ranges (default: 2 per worker)
+            workers (int, optional): Concurrent cursors (default: CPU count)
+            batch_size (int): Documents per server round trip
+            callback (callable, optional): Called as callback(partition_index, documents)
+                where documents is an iterator over that partition
+            max_buffered_batches (int): Batches queued for the consumer before
+                workers wait (merged stream only)
+            use_split_vector (bool): Try splitVector for the boundaries
+
+        Returns:
+            generator or list: Unordered documents, or the callback results
+        """
+        workers = workers or os.cpu_count() or 4
+        partitions = partitions or workers * 2
+        boundaries = self.partition_boundaries(
+            collection_name, partitions, filter_dict, use_split_vector=use_split_vector
+        )
+        bounds = [None] + boundaries + [None]
+        filters = [
+            self._range_filter(filter_dict, lower, upper)
+            for lower, upper in zip(bounds, bounds[1:])
+        ]
+
+        if callback is not None:
+            def scan_partition(index):
+                cursor = self._find(collection_name, filters[index], projection, batch_size)
+                with cursor:
+                    return callback(index, iter(cursor))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(scan_partition, range(len(filters))))
+
+        return self._merged_scan(collection_name, filters, projection, workers, batch_size,
+                                 max_buffered_batches)
+
+    def _merged_scan(self, collection_name, filters, projection, workers, batch_size,
+                     max_buffered_batches):
+        """Yield documents from all partitions as workers produce them"""
+        batches = queue.Queue(maxsize=max_buffered_batches)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            # Give up if the consumer went away
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan_partition(partition_filter):
+            try:
+                cursor = self._find(collection_name, partition_filter, projection, batch_size)
+                with cursor:
+                    batch = []
+                    for document in cursor:
+                        batch.append(document)
+                        if len(batch) >= batch_size:
+                            if not put(batch):
+                                return
+                            batch = []
+                    if batch:
+                        put(batch)
+            except Exception as e:
+                put(e)
+            finally:
+                put(done)
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        for partition_filter in filters:
+            executor.submit(scan_partition, partition_filter)
+
+        try:
+            remaining = len(filters)
+            while remaining:
+                item = batches.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield from item
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _write_batch(self, collection_name, indexes, models, ordered, bypass_document_validation):
+        """Run one bulk_write batch and return its counts and errors"""
+        counts = {"inserted": 0, "matched": 0, "modified": 0, "deleted": 0, "upserted": 0}
+        errors = []
+        try:
+            result = self.db[collection_name].bulk_write(
+                models, ordered=ordered, bypass_document_validation=bypass_document_validation
+            )
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            for error in details.get("writeErrors", []):
+                errors.append({
+                    "index": indexes[error["index"]],
+                    "code": error.get("code"),
+                    "message": error.get("errmsg")
+                })
+            for concern_error in details.get("writeConcernErrors", []):
+                errors.append({
+                    "index": None,
+                    "code": concern_error.get("code"),
+                    "message": concern_error.get("errmsg")
+                })
+        except Exception as e:
+            # The whole batch failed (e.g. network error); report every operation
+            details = {}
+            errors = [{"index": index, "code": None, "message": str(e)} for index in indexes]
+        finally:
+            self.invalidate_cache(collection_name)
+
+        counts["inserted"] = details.get("nInserted", 0)
+        counts["matched"] = details.get("nMatched", 0)
+        counts["modified"] = details.get("nModified", 0)
+        counts["deleted"] = details.get("nRemoved", 0)
+        counts["upserted"] = details.get("nUpserted", 0)
+        return counts, errors
+
+    def bulk_write(self, collection_name, operations, ordered=False, batch_size=BULK_BATCH_SIZE,
+                   max_batch_bytes=BULK_BATCH_BYTES, workers=1, bypass_document_validation=False):
+        """
+        Write many documents in batched bulk_write calls
+
+        Operations are consumed lazily and grouped into batches limited by
+        count and BSON size. Unordered batches can run on several threads;
+        ordered execution runs batches one at a time and stops at the
+        first failing batch.
+
+        Args:
+            collection_name (str): Name of the collection
+            operations (iterable): Write operations, see to_write_model
+            ordered (bool): Stop at the first error instead of continuing
+            batch_size (int): Maximum operations per batch
+            max_batch_bytes (int): Maximum approximate BSON bytes per batch
+            workers (int): Batches in flight at once (unordered only)
+            bypass_document_validation (bool): Skip schema validation
+
+        Returns:
+            dict: Totals (inserted, matched, modified, deleted, upserted, batches)
+                and errors, a list of {index, code, message} with indexes into operations
+        """
+        summary = {
+            "inserted": 0, "matched": 0, "modified": 0, "deleted": 0, "upserted": 0,
+            "batches": 0, "errors": []
+        }
+
+        def merge(counts, errors):
+            for key, value in counts.items():
+                summary[key] += value
+            summary["errors"].extend(errors)
+            summary["batches"] += 1
+
+        batches = _write_batches(operations, batch_size, max_batch_bytes, summary["errors"], ordered)
+        try:
+            if ordered or workers <= 1:
+                for indexes, models in batches:
+                    counts, errors = self._write_batch(
+                        collection_name, indexes, models, ordered, bypass_document_validation
+                    )
+                    merge(counts, errors)
+                    if ordered and errors:
+                        break
+            else:
+                in_flight = threading.BoundedSemaphore(workers * 2)
+                futures = []
+                try:
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        for indexes, models in batches:
+                            in_flight.acquire()
+                            future = executor.submit(
+                                self._write_batch, collection_name, indexes, models, False,
+                                bypass_document_validation
+                            )
+                            future.add_done_callback(lambda _: in_flight.release())
+                            futures.append(future)
+                finally:
+                    # Batches already sent are counted even if reading the input failed
+                    for future in futures:
+                        merge(*future.result())
+        except Exception as e:
+            # E.g. the operations iterable itself raised
+            print(f"Error preparing bulk write for {collection_name}: {e}")
+            summary["errors"].append({"index": None, "code": None, "message": str(e)})
+
+        summary["errors"].sort(key=lambda error: (error["index"] is None, error["index"] or 0))
+        return summary
+
+    def insert_documents(self, collection_name, documents, **options):
+        """
+        Insert many documents with unordered bulk writes
+
+        Args:
+            collection_name (str): Name of the collection
+            documents (iterable): Documents to insert
+            **options: Passed to bulk_write (batch_size, workers, ...)
+
+        Returns:
+            dict: Summary from bulk_write
+        """
+        operations = ({"op": "insert", "document": document} for document in documents)
+        return self.bulk_write(collection_name, operations, **options)
+
+    def aggregate(self, collection_name, pipeline, allow_disk_use=True, batch_size=1000):
+        """
+        Run an aggregation pipeline on the server
+
+        Args:
+            collection_name (str): Name of the collection
+            pipeline (list): Aggregation stages
+            allow_disk_use (bool): Let large $group/$sort stages spill to disk
+            batch_size (int): Result documents per server round trip
+
+        Returns:
+            list: Result documents
+        """
+        try:
+            cursor = self.db[collection_name].aggregate(
+                pipeline, allowDiskUse=allow_disk_use, batchSize=batch_size
+            )
+            with cursor:
+                return list(cursor)
+        except Exception as e:
+            print(f"Error aggregating {collection_name}: {e}")
+            return []
+
+    def count_by(self, collection_name, field, filter_dict=None, limit=None):
+        """
+        Count documents per value of a field, most common first
+
+        Args:
+            collection_name (str): Name of the collection
+            field (str): Field to group on (dotted paths allowed)
+            filter_dict (dict, optional): Only count matching documents
+            limit (int, optional): Return only the top values
+
+        Returns:
+            list: {"_id": value, "count": n} documents
+        """
+        pipeline = [{"$match": filter_dict}] if filter_dict else []
+        pipeline += [
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": DESCENDING, "_id": ASCENDING}}
+        ]
+        if limit:
+            pipeline.append({"$limit": limit})
+        return self.aggregate(collection_name, pipeline)
+
+    def group_by(self, collection_name, keys, accumulators, filter_dict=None, sort=None,
+                 limit=None):
+        """
+        Group documents and compute accumulators per group
+
+        Args:
+            collection_name (str): Name of the collection
+            keys (str or list): Field, or fields, to group on
+            accumulators (dict): Output field -> (operator, field), e.g.
+                {"total": ("sum", "price"), "events": ("count", None)},
+                or a raw accumulator expression such as {"$max": "$date"}
+            filter_dict (dict, optional): Only group matching documents
+            sort (dict, optional): Sort of the groups, e.g. {"total": -1}
+            limit (int, optional): Return only the first groups
+
+        Returns:
+            list: One document per group with _id and the accumulator fields
+        """
+        try:
+            group = {"_id": _group_key(keys)}
+            group.update({name: _accumulator(spec) for name, spec in accumulators.items()})
+        except ValueError as e:
+            print(f"Error grouping {collection_name}: {e}")
+            return []
+
+        pipeline = [{"$match": filter_dict}] if filter_dict else []
+        pipeline.append({"$group": group})
+        pipeline.append({"$sort": sort or {"_id": ASCENDING}})
+        if limit:
+            pipeline.append({"$limit": limit})
+        return self.aggregate(collection_name, pipeline)
+
+    def distinct_values(self, collection_name, field, filter_dict=None):
+        """
+        Return the distinct values of a field
+
+        Uses $group rather than the distinct command, so the result is
+        not limited to a single 16 MB document.
+
+        Args:
+            collection_name (str): Name of the collection
+            field (str): Field to collect values from
+            filter_dict (dict, optional): Only consider matching documents
+
+        Returns:
+            list: Distinct values in ascending order
+        """
+        pipeline = [{"$match": filter_dict}] if filter_dict else []
+        pipeline += [{"$group": {"_id": f"${field}"}}, {"$sort": {"_id": ASCENDING}}]
+        return [doc["_id"] for doc in self.aggregate(collection_name, pipeline)]
+
+    def bucket_by_date(self, collection_name, field, unit="day", filter_dict=None,
+                       accumulators=None, timezone="UTC"):
+        """
+        Count (or aggregate) documents per calendar period of a date field
+
+        Needs MongoDB 5.0+ for $dateTrunc.
+
+        Args:
+            collection_name (str): Name of the collection
+            field (str): Date field
+            unit (str): "year", "quarter", "month", "week", "day", "hour", ...
+            filter_dict (dict, optional): Only bucket matching documents
+            accumulators (dict, optional): Extra accumulators, as in group_by
+            timezone (str): Time zone the periods are aligned to
+
+        Returns:
+            list: One document per period: _id (period start), count and accumulators
+        """
+        group = {
+            "_id": {"$dateTrunc": {"date": f"${field}", "unit": unit, "timezone": timezone}},
+            "count": {"$sum": 1}
+        }
+        try:
+            group.update({name: _accumulator(spec) for name, spec in (accumulators or {}).items()})
+        except ValueError as e:
+            print(f"Error bucketing {collection_name}: {e}")
+            return []
+
+        pipeline = [{"$match": filter_dict}] if filter_dict else []
+        pipeline += [{"$group": group}, {"$sort": {"_id": ASCENDING}}]
+        return self.aggregate(collection_name, pipeline)
+
+    def top_n(self, collection_name, sort_field, n=10, filter_dict=None, projection=None,
+              descending=True, per_group=None):
+        """
+        Return the documents with the highest (or lowest) values of a field
+
+        Args:
+            collection_name (str): Name of the collection
+            sort_field (str): Field to rank by
+            n (int): Documents to return (per group when per_group is set)
+            filter_dict (dict, optional): Only rank matching documents
+            projection (dict, optional): Fields to return
+            descending (bool): Highest values first
+            per_group (str, optional): Rank separately within each value of this field
+                (needs MongoDB 5.2+ for $topN)
+
+        Returns:
+            list: Top documents, or {"_id": group, "top": [...]} per group
+        """
+        direction = DESCENDING if descending else ASCENDING
+        pipeline = [{"$match": filter_dict}] if filter_dict else []
+        if per_group:
+            output = "$$ROOT" if not projection else {
+                field: f"${field}" for field, include in projection.items() if include
+            }
+            pipeline += [
+                {"$group": {
+                    "_id": f"${per_group}",
+                    "top": {"$topN": {"n": n, "sortBy": {sort_field: direction}, "output": output}}
+                }},
+                {"$sort": {"_id": ASCENDING}}
+            ]
+        else:
+            pipeline += [{"$sort": {sort_field: direction}}, {"$limit": n}]
+            if projection:
+                pipeline.append({"$project": projection})
+        return self.aggregate(collection_name, pipeline)
+
+    def fetch_all_documents(self, collection_name, projection=None, batch_size=1000):
         """
         Fetch all documents from a specific collection
         
         Args:
             collection_name (str): Name of the collection
+            projection (dict or list, optional): Fields to return
+            batch_size (int): Documents per server round trip
         """
         try:
-            collection = self.db[collection_name]
-            documents = list(collection.find({}))
-            return documents
+            return list(self._find(collection_name, None, projection, batch_size))
         except Exception as e:
             print(f"Error fetching documents from {collection_name}: {e}")
             return []
     
-    def fetch_documents_with_filter(self, collection_name, filter_dict):
+    def fetch_documents_with_filter(self, collection_name, filter_dict, projection=None,
+                                    batch_size=1000, sort=None):
         """
         Fetch documents that match specific criteria
         
+        With a query cache, repeated queries are answered from memory
+        until the collection is invalidated or the entry expires.
+        
         Args:
             collection_name (str): Name of the collection
             filter_dict (dict): Filter criteria
+            projection (dict or list, optional): Fields to return
+            batch_size (int): Documents per server round trip
+            sort (str or list, optional): Sort key, or list of (key, direction) pairs
         """
+        if self.query_cache is not None:
+            key = query_key(collection_name, filter_dict, projection, sort)
+            documents = self.query_cache.get(key)
+            if documents is not None:
+                return documents
+            generation = self.query_cache.generation(collection_name)
+
         try:
-            collection = self.db[collection_name]
-            documents = list(collection.find(filter_dict))
-            return documents
+            documents = list(self._find(collection_name, filter_dict, projection, batch_size,
+                                        sort=sort))
         except Exception as e:
             print(f"Error fetching filtered documents from {collection_name}: {e}")
             return []
 
+        if self.query_cache is not None:
+            self.query_cache.put(key, documents, generation)
+        return documents
+
+    def invalidate_cache(self, collection_name=None):
+        """
+        Drop cached query results after writing to a collection
+
+        Args:
+            collection_name (str, optional): Collection written to (default: all)
+        """
+        if self.query_cache is not None:
+            self.query_cache.invalidate(collection_name)
+
+    def watch_for_changes(self):
+        """
+        Invalidate the query cache from a change stream on this database
+
+        Needs a replica set or sharded cluster; elsewhere call
+        invalidate_cache() after writes instead.
+        """
+        if self.query_cache is not None:
+            self.query_cache.watch(self.db)
+
     def close_connection(self):
-        """Close the MongoDB connection"""
+        """
+        Close the MongoDB connection
+
+        A shared client stays open for the other users of the registry;
+        use close_shared_clients() to close those at shutdown.
+        """
+        if self.shared:
+            return
         try:
             self.client.close()
         except Exception as e:
             print(f"Error closing connection: {e}")
 
 
+def display_catalog(catalog, numbered=False):
+    """
+    Display the collection catalog
+
+    Args:
+        catalog (list): CollectionInfo entries
+        numbered (bool): Number the collections for selection
+    """
+    print("\nAvailable collections:")
+    for i, info in enumerate(catalog, 1):
+        prefix = f"{i}." if numbered else "-"
+        count = "?" if info.count is None else f"{info.count:,}"
+        line = f"{prefix} {info.name} ({count} documents, {format_bytes(info.size)})"
+        if (info.count or 0) > LARGE_COLLECTION_DOCUMENTS:
+            line += " [large]"
+        print(line)
+
+
+def choose_collection(mongo_client):
+    """
+    Ask the user to pick a collection from the catalog
+
+    Args:
+        mongo_client (MongoDBClient): Client to read the catalog from
+
+    Returns:
+        str: Chosen collection name, or None if the choice was invalid
+    """
+    catalog = mongo_client.collection_catalog()
+    display_catalog(catalog, numbered=True)
+
+    collection_index = int(input("\nEnter collection number: ")) - 1
+    if 0 <= collection_index < len(catalog):
+        return catalog[collection_index].name
+    print("Invalid collection number")
+    return None
+
+
 def main():
     try:
         # Initialize MongoDB client
@@ -106,61 +1231,57 @@ def main():
             print("2. View all documents in a collection")
             print("3. Search documents with filter")
             print("4. Exit")
+            print("5. Refresh collection list")
             
-            choice = input("\nEnter your choice (1-4): ")
+            choice = input("\nEnter your choice (1-5): ")
             
             if choice == "1":
-                collections = mongo_client.list_collections()
-                print("\nAvailable collections:")
-                for collection in collections:
-                    print(f"- {collection}")
+                display_catalog(mongo_client.collection_catalog())
                     
             elif choice == "2":
-                collections = mongo_client.list_collections()
-                print("\nAvailable collections:")
-                for i, collection in enumerate(collections, 1):
-                    print(f"{i}. {collection}")
-                    
-                collection_index = int(input("\nEnter collection number: ")) - 1
-                if 0 <= collection_index < len(collections):
-                    documents = mongo_client.fetch_all_documents(collections[collection_index])
-                    display_documents(documents)
-                else:
-                    print("Invalid collection number")
+                collection_name = choose_collection(mongo_client)
+                if collection_name:
+                    # Browse page by page; each page resumes after the previous one
+                    for documents, token in mongo_client.iter_pages(collection_name):
+                        display_documents(documents)
+                        if token and input("\nPress Enter for the next page (q to stop): ").lower() == "q":
+                            print(f"Resume token: {token}")
+                            break
+                    else:
+                        print("\nNo more documents")
                     
             elif choice == "3":
-                collections = mongo_client.list_collections()
-                print("\nAvailable collections:")
-                for i, collection in enumerate(collections, 1):
-                    print(f"{i}. {collection}")
-                    
-                collection_index = int(input("\nEnter collection number: ")) - 1
-                if 0 <= collection_index < len(collections):
-                    print("\nEnter filter criteria (example: {'field': 'value'}):")
-                    filter_str = input()
+                collection_name = choose_collection(mongo_client)
+                if collection_name:
+                    print("\nEnter filter criteria as JSON (example: {\"field\": \"value\"}):")
                     try:
-                        filter_dict = eval(filter_str)
-                        documents = mongo_client.fetch_documents_with_filter(
-                            collections[collection_index],
-                            filter_dict
-                        )
-                        display_documents(documents)
-                    except Exception as e:
+                        filter_dict = parse_filter(input())
+                    except ValueError as e:
                         print(f"Error parsing filter: {e}")
-                else:
-                    print("Invalid collection number")
+                        continue
+                    
+                    if not filter_dict and mongo_client.is_large_collection(collection_name):
+                        answer = input("This collection is large and the filter matches everything. "
+                                       "Continue? (y/N): ")
+                        if answer.lower() != "y":
+                            continue
+                    documents = mongo_client.iter_documents(collection_name, filter_dict)
+                    display_documents(documents)
                     
             elif choice == "4":
                 print("\nClosing connection...")
                 mongo_client.close_connection()
+                close_shared_clients()
                 break
                 
+            elif choice == "5":
+                display_catalog(mongo_client.refresh_catalog())
+                
             else:
                 print("Invalid choice! Please try again.")
                 
     except Exception as e:
         print(f"An error occurred: {e}")
 
-
 if __name__ == "__main__":
     main()
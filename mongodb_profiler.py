@@ -0,0 +1,280 @@
+import threading
+
+from bson import json_util
+
+# Operators that select a single value (equality) or a range, for ESR index ordering
+EQUALITY_OPERATORS = {"$eq", "$in"}
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$exists", "$regex"}
+
+
+def query_shape(value):
+    """
+    Replace the literal values of a filter with placeholders
+
+    Queries that differ only in their values share a shape, e.g.
+    {"city": "Auckland"} and {"city": "Wellington"} are both {"city": "?"}.
+
+    Args:
+        value: Filter document or part of one
+
+    Returns:
+        The same structure with literal values replaced by "?"
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in sorted(value.items())}
+    if isinstance(value, list):
+        # Lists of conditions ($and/$or) keep their structure; value lists collapse
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item) for item in value]
+        return "?"
+    return "?"
+
+
+def _plan_stages(plan):
+    """Collect (stage, index name) pairs from a winning plan tree"""
+    stages = []
+    if not isinstance(plan, dict):
+        return stages
+    if "stage" in plan:
+        stages.append((plan["stage"], plan.get("indexName")))
+    for key in ("inputStage", "queryPlan"):
+        stages.extend(_plan_stages(plan.get(key)))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+def _field_usage(filter_dict, equality, ranges):
+    """Sort the fields of a filter into equality and range lists"""
+    for key, condition in filter_dict.items():
+        if key == "$and":
+            for clause in condition:
+                _field_usage(clause, equality, ranges)
+        elif key.startswith("$"):
+            # $or/$nor/$expr need an index per branch; not handled here
+            continue
+        elif isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+            if set(condition) & EQUALITY_OPERATORS and not set(condition) & RANGE_OPERATORS:
+                target = equality
+            else:
+                target = ranges
+            if key not in equality and key not in ranges:
+                target.append(key)
+        elif key not in equality:
+            if key in ranges:
+                ranges.remove(key)
+            equality.append(key)
+
+
+def recommend_index(filter_dict, sort=None):
+    """
+    Suggest an index for a query following the equality-sort-range rule
+
+    Args:
+        filter_dict (dict): Filter criteria
+        sort (str or list, optional): Sort key, or list of (key, direction) pairs
+
+    Returns:
+        list: Index keys as (field, direction) pairs, empty if nothing to index
+    """
+    equality, ranges = [], []
+    _field_usage(filter_dict or {}, equality, ranges)
+    if isinstance(sort, str):
+        sort = [(sort, 1)]
+
+    keys = [(field, 1) for field in equality]
+    for field, direction in sort or []:
+        if field not in equality:
+            keys.append((field, direction))
+    used = {field for field, _ in keys}
+    keys += [(field, 1) for field in ranges if field not in used]
+    return keys
+
+
+class QueryProfiler:
+    """
+    Records query shapes and explains each new shape once
+
+    For every shape it keeps how often it ran and the executionStats of
+    its first run: documents and keys examined, documents returned,
+    execution time and whether the winning plan scanned the collection.
+    From that it recommends indexes for COLLSCAN and unselective queries.
+    """
+
+    def __init__(self, db, explain=True, examined_ratio=10):
+        """
+        Initialize the profiler
+
+        Args:
+            db (Database): Database the queries run against
+            explain (bool): Run explain() on each new shape
+            examined_ratio (float): docsExamined / nReturned above which a
+                query counts as unselective
+        """
+        self.db = db
+        self.explain = explain
+        self.examined_ratio = examined_ratio
+        self._shapes = {}
+        self._lock = threading.Lock()
+
+    def record(self, collection_name, filter_dict=None, projection=None, sort=None, limit=0):
+        """
+        Record one query, explaining it if its shape is new
+
+        Args:
+            collection_name (str): Name of the collection
+            filter_dict (dict, optional): Filter criteria
+            projection (dict or list, optional): Fields returned
+            sort (str or list, optional): Sort specification
+            limit (int): Maximum number of documents (0: no limit); explain
+                runs the query, so it is limited the same way
+        """
+        filter_dict = filter_dict or {}
+        key = (collection_name, json_util.dumps(query_shape(filter_dict)), json_util.dumps(sort))
+        with self._lock:
+            entry = self._shapes.get(key)
+            if entry is not None:
+                entry["count"] += 1
+                return
+            entry = self._shapes[key] = {
+                "collection": collection_name,
+                "shape": query_shape(filter_dict),
+                "sort": sort,
+                "example": filter_dict,
+                "count": 1,
+                "stats": None
+            }
+
+        if self.explain:
+            entry["stats"] = self._explain(collection_name, filter_dict, projection, sort, limit)
+
+    def _explain(self, collection_name, filter_dict, projection, sort, limit=0):
+        command = {"find": collection_name, "filter": filter_dict}
+        if limit:
+            command["limit"] = limit
+        if projection:
+            if isinstance(projection, (list, tuple)):
+                projection = {field: 1 for field in projection}
+            command["projection"] = projection
+        if sort:
+            command["sort"] = dict([(sort, 1)] if isinstance(sort, str) else sort)
+        try:
+            result = self.db.command("explain", command, verbosity="executionStats")
+        except Exception as e:
+            return {"error": str(e)}
+
+        execution = result.get("executionStats", {})
+        stages = _plan_stages(result.get("queryPlanner", {}).get("winningPlan", {}))
+        return {
+            "n_returned": execution.get("nReturned", 0),
+            "docs_examined": execution.get("totalDocsExamined", 0),
+            "keys_examined": execution.get("totalKeysExamined", 0),
+            "execution_ms": execution.get("executionTimeMillis", 0),
+            "collscan": any(stage == "COLLSCAN" for stage, _ in stages),
+            "indexes": sorted({index for _, index in stages if index})
+        }
+
+    def _needs_index(self, stats):
+        if not stats or "error" in stats:
+            return False
+        if stats["collscan"]:
+            return True
+        returned = max(1, stats["n_returned"])
+        return stats["docs_examined"] / returned > self.examined_ratio
+
+    def report(self):
+        """
+        Return one entry per query shape, worst first
+
+        Returns:
+            list: Dicts with collection, shape, sort, count, stats,
+                needs_index and recommended_index
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._shapes.values()]
+        for entry in entries:
+            # A query with no filter fields or sort (e.g. fetch everything) has nothing to index
+            recommended = recommend_index(entry.pop("example"), entry["sort"])
+            entry["needs_index"] = bool(recommended) and self._needs_index(entry["stats"])
+            entry["recommended_index"] = recommended if entry["needs_index"] else []
+        return sorted(
+            entries,
+            key=lambda entry: (
+                not entry["needs_index"],
+                -((entry["stats"] or {}).get("docs_examined", 0) * entry["count"])
+            )
+        )
+
+    def recommendations(self):
+        """
+        Return the distinct index suggestions
+
+        Returns:
+            list: (collection name, index keys) pairs
+        """
+        seen = []
+        for entry in self.report():
+            suggestion = (entry["collection"], entry["recommended_index"])
+            if entry["recommended_index"] and suggestion not in seen:
+                seen.append(suggestion)
+        return seen
+
+    def create_recommended_indexes(self, dry_run=False):
+        """
+        Create the suggested indexes
+
+        Args:
+            dry_run (bool): Only print what would be created
+
+        Returns:
+            list: Names of the indexes created (or that would be created)
+        """
+        created = []
+        for collection_name, keys in self.recommendations():
+            name = "_".join(f"{field}_{direction}" for field, direction in keys)
+            if dry_run:
+                print(f"Would create index {name} on {collection_name}")
+                created.append(name)
+                continue
+            try:
+                created.append(self.db[collection_name].create_index(keys))
+            except Exception as e:
+                print(f"Error creating index {name} on {collection_name}: {e}")
+        return created
+
+    def reset(self):
+        """Forget every recorded shape"""
+        with self._lock:
+            self._shapes.clear()
+
+
+def display_profile(report):
+    """
+    Display a profiler report
+
+    Args:
+        report (list): Entries from QueryProfiler.report()
+    """
+    if not report:
+        print("No queries recorded")
+        return
+
+    print("\n=== Query Profile ===")
+    for entry in report:
+        stats = entry["stats"] or {}
+        print("\n" + "-"*50)
+        print(f"Collection: {entry['collection']}")
+        print(f"Shape: {json_util.dumps(entry['shape'])}")
+        if entry["sort"]:
+            print(f"Sort: {entry['sort']}")
+        print(f"Runs: {entry['count']}")
+        if "error" in stats:
+            print(f"Explain failed: {stats['error']}")
+        elif stats:
+            plan = "COLLSCAN" if stats["collscan"] else ", ".join(stats["indexes"]) or "-"
+            print(f"Plan: {plan}")
+            print(f"Docs examined / returned: {stats['docs_examined']} / {stats['n_returned']}")
+            print(f"Execution time: {stats['execution_ms']} ms")
+        if entry["needs_index"]:
+            keys = ", ".join(f"{field}: {direction}" for field, direction in entry["recommended_index"])
+            print(f"Recommended index: {{{keys}}}")
@@ -1,6 +1,12 @@
+from array import array
+
+
 class Animal:
     """Base class for all animals"""
     
+    # No per-instance __dict__, so millions of animals stay small
+    __slots__ = ("name", "age", "energy")
+    
     def __init__(self, name, age):
         """
         Initialize an animal
@@ -35,6 +41,8 @@ class Animal:
 class Dog(Animal):
     """Dog class that inherits from Animal"""
     
+    __slots__ = ("breed", "_tricks")
+    
     def __init__(self, name, age, breed):
         """
         Initialize a dog
@@ -46,7 +54,19 @@ class Dog(Animal):
         """
         super().__init__(name, age)
         self.breed = breed
-        self.tricks = []
+        # Most dogs never learn a trick; the list is created on first use
+        self._tricks = None
+    
+    @property
+    def tricks(self):
+        """List of tricks the dog knows"""
+        if self._tricks is None:
+            self._tricks = []
+        return self._tricks
+    
+    @tricks.setter
+    def tricks(self, tricks):
+        self._tricks = tricks
     
     def make_sound(self):
         """Override the make_sound method"""
@@ -69,7 +89,7 @@ class Dog(Animal):
         Args:
             trick (str): Name of the trick to perform
         """
-        if trick in self.tricks:
+        if self._tricks and trick in self._tricks:
             self.energy -= 10
             return f"{self.name} performs: {trick}"
         return f"{self.name} doesn't know how to {trick}"
@@ -77,13 +97,15 @@ class Dog(Animal):
     def get_info(self):
         """Override get_info to include breed and tricks"""
         base_info = super().get_info()
-        tricks_info = f"Tricks known: {', '.join(self.tricks) if self.tricks else 'None'}"
+        tricks_info = f"Tricks known: {', '.join(self._tricks) if self._tricks else 'None'}"
         return f"{base_info}, Breed: {self.breed}, {tricks_info}"
 
 
 class Cat(Animal):
     """Cat class that inherits from Animal"""
     
+    __slots__ = ("color", "mice_caught")
+    
     def __init__(self, name, age, color):
         """
         Initialize a cat
@@ -120,6 +142,249 @@ class Cat(Animal):
         return f"{base_info}, Color: {self.color}, Mice caught: {self.mice_caught}"
 
 
+def _column(column):
+    """Property reading and writing one row of a population column"""
+    def get(self):
+        return getattr(self._population, column)[self._index]
+
+    def set(self, value):
+        population = self._population
+        getattr(population, column)[self._index] = population._convert(column, value)
+
+    return property(get, set)
+
+
+def _category(column):
+    """Property for a column stored as codes into a table of distinct values"""
+    def get(self):
+        population = self._population
+        return population._values[column][getattr(population, column)[self._index]]
+
+    def set(self, value):
+        population = self._population
+        getattr(population, column)[self._index] = population._code(column, value)
+
+    return property(get, set)
+
+
+def _get_tricks(self):
+    return self._population._tricks.get(self._index)
+
+
+def _set_tricks(self, tricks):
+    self._population._tricks[self._index] = tricks
+
+
+class _PopulationRow:
+    """Mixin storing an animal's fields in a row of an AnimalPopulation"""
+    
+    # No slots of its own, so it combines with the slotted animal classes
+    __slots__ = ()
+    
+    def __init__(self, population, index):
+        """
+        Create a view; use AnimalPopulation indexing rather than calling this
+        
+        Args:
+            population (AnimalPopulation): Population holding the data
+            index (int): Row of the animal
+        """
+        self._population = population
+        self._index = index
+    
+    name = _column("names")
+    age = _column("ages")
+    energy = _column("energies")
+
+
+class AnimalView(_PopulationRow, Animal):
+    """An Animal whose state lives in a row of an AnimalPopulation"""
+    
+    __slots__ = ("_population", "_index")
+
+
+class DogView(_PopulationRow, Dog):
+    """A Dog whose state lives in a row of an AnimalPopulation"""
+    
+    __slots__ = ("_population", "_index")
+    
+    breed = _category("breeds")
+    _tricks = property(_get_tricks, _set_tricks)
+
+
+class CatView(_PopulationRow, Cat):
+    """A Cat whose state lives in a row of an AnimalPopulation"""
+    
+    __slots__ = ("_population", "_index")
+    
+    color = _category("colors")
+    mice_caught = _column("mice_caught")
+
+
+class AnimalPopulation:
+    """
+    Column-oriented storage for large numbers of animals
+    
+    Each attribute is a typed array with one entry per animal, so an
+    animal costs a few bytes per field instead of a full object. Breeds
+    and colors repeat a lot and are stored as codes into a table of
+    distinct values; tricks are kept only for dogs that learned one.
+    Indexing returns a view object with the usual Animal, Dog or Cat
+    methods (sleep, hunt, groom, do_trick, get_info, ...).
+    """
+    
+    # Kind codes stored in the kinds column, and the view class for each
+    ANIMAL, DOG, CAT = 0, 1, 2
+    VIEWS = (AnimalView, DogView, CatView)
+    
+    # Names of the numeric columns in error messages
+    COLUMN_LABELS = {"ages": "Age", "energies": "Energy", "mice_caught": "Mice caught"}
+    
+    def __init__(self):
+        """Initialize an empty population"""
+        self.kinds = array("b")
+        self.names = []
+        self.ages = array("H")
+        # Tricks and grooming have no lower bound on energy, so give it 64 bits
+        self.energies = array("q")
+        self.breeds = array("H")
+        self.colors = array("H")
+        self.mice_caught = array("I")
+        # Code 0 means "not applicable" (e.g. the breed of a cat)
+        self._values = {"breeds": [None], "colors": [None]}
+        self._codes = {"breeds": {None: 0}, "colors": {None: 0}}
+        self._tricks = {}
+    
+    def _convert(self, column, value):
+        """
+        Check that a value fits a numeric column
+        
+        Args:
+            column (str): Column name, e.g. "ages"
+            value (int): Value to store
+        
+        Returns:
+            int: The value as stored
+        
+        Raises:
+            ValueError: If the value is not a whole number in the column's range
+        """
+        typecode = getattr(self, column).typecode
+        try:
+            return array(typecode, [value])[0]
+        except (OverflowError, TypeError):
+            bits = 8 * array(typecode).itemsize
+            low, high = (0, 2 ** bits - 1) if typecode.isupper() else (-2 ** (bits - 1), 2 ** (bits - 1) - 1)
+            raise ValueError(f"{self.COLUMN_LABELS[column]} must be a whole number from {low} to {high}, got {value!r}") from None
+    
+    def _code(self, column, value):
+        """Return the code of a breed or color, adding it if new"""
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = len(self._values[column])
+            if code >= 1 << 8 * getattr(self, column).itemsize:
+                raise ValueError(f"A population holds at most {code} distinct {column}")
+            codes[value] = code
+            self._values[column].append(value)
+        return code
+    
+    def _append(self, kind, name, age, breed=None, color=None):
+        # Convert every typed value before appending, so a bad one cannot
+        # leave the columns with different lengths
+        age = self._convert("ages", age)
+        breed_code = self._code("breeds", breed)
+        color_code = self._code("colors", color)
+        self.kinds.append(kind)
+        self.names.append(name)
+        self.ages.append(age)
+        self.energies.append(100)
+        self.breeds.append(breed_code)
+        self.colors.append(color_code)
+        self.mice_caught.append(0)
+        return self[len(self.kinds) - 1]
+    
+    def add_animal(self, name, age):
+        """
+        Add a generic animal
+        
+        Args:
+            name (str): Name of the animal
+            age (int): Age of the animal in years
+        
+        Returns:
+            AnimalView: View of the new animal
+        """
+        return self._append(self.ANIMAL, name, age)
+    
+    def add_dog(self, name, age, breed):
+        """
+        Add a dog
+        
+        Args:
+            name (str): Name of the dog
+            age (int): Age of the dog in years
+            breed (str): Breed of the dog
+        
+        Returns:
+            DogView: View of the new dog
+        """
+        return self._append(self.DOG, name, age, breed=breed)
+    
+    def add_cat(self, name, age, color):
+        """
+        Add a cat
+        
+        Args:
+            name (str): Name of the cat
+            age (int): Age of the cat in years
+            color (str): Color of the cat's fur
+        
+        Returns:
+            CatView: View of the new cat
+        """
+        return self._append(self.CAT, name, age, color=color)
+    
+    def __len__(self):
+        return len(self.kinds)
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("animal index out of range")
+        return self.VIEWS[self.kinds[index]](self, index)
+    
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
+    
+    def of_kind(self, kind):
+        """
+        Iterate over the animals of one kind
+        
+        Args:
+            kind (int): ANIMAL, DOG or CAT
+        
+        Yields:
+            AnimalView: View of each matching animal
+        """
+        view = self.VIEWS[kind]
+        for index, animal_kind in enumerate(self.kinds):
+            if animal_kind == kind:
+                yield view(self, index)
+    
+    def sleep_all(self, hours):
+        """
+        Let every animal sleep, updating the energy column directly
+        
+        Args:
+            hours (int): Number of hours to sleep
+        """
+        gain = hours * 10
+        self.energies = array("q", (min(100, energy + gain) for energy in self.energies))
+
+
 def main():
     # Create some animals
     dog = Dog("Buddy", 3, "Golden Retriever")
@@ -146,6 +411,22 @@ def main():
     print(cat.groom())
     print(cat.hunt())
     print(cat.sleep(5))
+    
+    # Population demo: same methods, data kept in columns
+    print("\nPopulation Demo:")
+    population = AnimalPopulation()
+    for i in range(1000):
+        population.add_dog(f"Dog {i}", i % 15, "Beagle" if i % 2 else "Poodle")
+        population.add_cat(f"Cat {i}", i % 18, "Black" if i % 3 else "Tabby")
+    rex = population[0]
+    print(rex.learn_trick("fetch"))
+    print(rex.do_trick("fetch"))
+    print(rex.get_info())
+    print(population[1].hunt())
+    print(population[1].groom())
+    population.sleep_all(1)
+    print(population[1].get_info())
+    print(f"{len(population)} animals stored")
 
 
 if __name__ == "__main__":
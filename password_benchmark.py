@@ -0,0 +1,216 @@
+import argparse
+import json
+import math
+import sys
+import time
+from datetime import datetime, timezone
+
+from password_generator import compile_pool, generate_password, generate_passwords
+
+# Character set combinations benchmarked, as (use_letters, use_numbers, use_symbols)
+CHARSETS = {
+    "digits": (False, True, False),
+    "letters": (True, False, False),
+    "alnum": (True, True, False),
+    "all": (True, True, True)
+}
+
+
+def run_case(path, length, charset, batch_size, total):
+    """
+    Time one way of generating passwords
+
+    Args:
+        path (str): "single" (generate_password per password) or "batch" (generate_passwords)
+        length (int): Password length
+        charset (str): Character set combination, one of CHARSETS
+        batch_size (int): Passwords per generate_passwords call (batch path only)
+        total (int): Number of passwords to generate
+
+    Returns:
+        dict: Passwords per second and entropy bytes per second
+    """
+    options = CHARSETS[charset]
+    started = time.perf_counter()
+    if path == "single":
+        for _ in range(total):
+            generate_password(length, *options)
+    else:
+        remaining = total
+        while remaining > 0:
+            remaining -= len(generate_passwords(min(batch_size, remaining), length, *options))
+    duration = time.perf_counter() - started
+
+    # Every character is a uniform choice from the pool
+    bits_per_password = length * math.log2(len(compile_pool(*options).characters))
+    passwords_per_s = total / duration if duration else 0.0
+    return {
+        "path": path,
+        "length": length,
+        "charset": charset,
+        "batch_size": 1 if path == "single" else batch_size,
+        "passwords": total,
+        "duration_s": round(duration, 4),
+        "passwords_per_s": round(passwords_per_s, 1),
+        "entropy_bytes_per_s": round(passwords_per_s * bits_per_password / 8, 1)
+    }
+
+
+def chi_square_p_value(statistic, degrees):
+    """
+    Upper-tail p-value of a chi-square statistic
+
+    Uses the Wilson-Hilferty normal approximation, which is accurate for
+    the degrees of freedom of any character pool (9 and up).
+
+    Args:
+        statistic (float): Chi-square statistic
+        degrees (int): Degrees of freedom
+
+    Returns:
+        float: Probability of a statistic at least this large under uniformity
+    """
+    if degrees < 1:
+        return 1.0
+    scale = 2 / (9 * degrees)
+    z = ((statistic / degrees) ** (1 / 3) - (1 - scale)) / math.sqrt(scale)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def chi_square_positions(passwords, characters):
+    """
+    Chi-square test of uniformity for each character position
+
+    Args:
+        passwords (list): Passwords of equal length
+        characters (str): Character pool they were drawn from
+
+    Returns:
+        list: Per position, a dict with the statistic, degrees of freedom and p-value
+    """
+    if not passwords:
+        return []
+    expected = len(passwords) / len(characters)
+    results = []
+    for position in range(len(passwords[0])):
+        counts = dict.fromkeys(characters, 0)
+        for password in passwords:
+            counts[password[position]] += 1
+        statistic = sum((observed - expected) ** 2 for observed in counts.values()) / expected
+        degrees = len(characters) - 1
+        results.append({
+            "position": position,
+            "chi_square": round(statistic, 2),
+            "degrees": degrees,
+            "p_value": chi_square_p_value(statistic, degrees)
+        })
+    return results
+
+
+def check_uniformity(length, charset, samples=100000, alpha=0.001):
+    """
+    Check that generate_passwords picks every character uniformly
+
+    The significance level is split across positions (Bonferroni), so a
+    failure means real bias rather than one unlucky position out of many.
+
+    Args:
+        length (int): Password length
+        charset (str): Character set combination, one of CHARSETS
+        samples (int): Passwords to draw
+        alpha (float): Overall significance level
+
+    Returns:
+        dict: Worst position's p-value and whether the check passed
+    """
+    options = CHARSETS[charset]
+    passwords = generate_passwords(samples, length, *options)
+    positions = chi_square_positions(passwords, compile_pool(*options).characters)
+    worst = min(positions, key=lambda result: result["p_value"])
+    return {
+        "length": length,
+        "charset": charset,
+        "samples": samples,
+        "worst_position": worst["position"],
+        "worst_p_value": worst["p_value"],
+        "passed": worst["p_value"] >= alpha / len(positions)
+    }
+
+
+def append_history(path, results, uniformity, label=None):
+    """
+    Append a benchmark run to a JSON Lines history file
+
+    Args:
+        path (str): History file
+        results (list): Reports from run_case
+        uniformity (list): Reports from check_uniformity
+        label (str, optional): Free-form label, e.g. a branch or commit
+    """
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "results": results,
+        "uniformity": uniformity
+    }
+    with open(path, "a") as history:
+        history.write(json.dumps(record) + "\n")
+
+
+def display_results(results, uniformity):
+    """
+    Display throughput and uniformity reports as tables
+
+    Args:
+        results (list): Reports from run_case
+        uniformity (list): Reports from check_uniformity
+    """
+    print(f"\n{'path':<8}{'charset':<9}{'length':>7}{'batch':>8}{'passwords/s':>14}{'entropy B/s':>14}")
+    for result in results:
+        print(f"{result['path']:<8}{result['charset']:<9}{result['length']:>7}{result['batch_size']:>8}"
+              f"{result['passwords_per_s']:>14}{result['entropy_bytes_per_s']:>14}")
+
+    print(f"\n{'charset':<9}{'length':>7}{'samples':>10}{'worst pos':>11}{'p-value':>12}  result")
+    for check in uniformity:
+        print(f"{check['charset']:<9}{check['length']:>7}{check['samples']:>10}"
+              f"{check['worst_position']:>11}{check['worst_p_value']:>12.4g}  "
+              f"{'ok' if check['passed'] else 'BIASED'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark password_generator and check its output is uniform")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--charsets", nargs="+", choices=sorted(CHARSETS), default=list(CHARSETS))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--total", type=int, default=100000, help="passwords generated per case")
+    parser.add_argument("--samples", type=int, default=100000, help="passwords drawn per uniformity check")
+    parser.add_argument("--alpha", type=float, default=0.001, help="significance level of the uniformity check")
+    parser.add_argument("--history", default="password_bench_history.jsonl", help="JSON Lines file to append to")
+    parser.add_argument("--label", help="label stored with this run in the history")
+    args = parser.parse_args()
+
+    results = []
+    for charset in args.charsets:
+        for length in args.lengths:
+            results.append(run_case("single", length, charset, 1, args.total))
+            for batch_size in args.batch_sizes:
+                results.append(run_case("batch", length, charset, batch_size, args.total))
+
+    uniformity = [
+        check_uniformity(length, charset, args.samples, args.alpha)
+        for charset in args.charsets
+        for length in args.lengths
+    ]
+
+    display_results(results, uniformity)
+    if args.history:
+        append_history(args.history, results, uniformity, args.label)
+        print(f"\nResults appended to {args.history}")
+
+    # A failed uniformity check fails the run, e.g. in CI
+    if not all(check["passed"] for check in uniformity):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,145 @@
-import random
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import secrets
 import string
+import sys
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    # Fall back to bytes.translate for mapping random bytes onto the pool
+    np = None
+
+# Character classes in the order they are added to the pool
+CHARACTER_CLASSES = (
+    ("letters", string.ascii_letters),
+    ("numbers", string.digits),
+    ("symbols", string.punctuation)
+)
+
+# Random bytes requested from the operating system per read
+ENTROPY_BLOCK_SIZE = 65536
+
+# Passwords generated per unit of work in the streaming API
+STREAM_CHUNK_SIZE = 10000
+
+# A compiled character pool. Random bytes below `limit` map onto the pool
+# without bias (limit is a multiple of the pool size); larger bytes are
+# rejected. `table` and `rejected` drive bytes.translate, `codes` NumPy.
+CharacterPool = namedtuple("CharacterPool", ["characters", "classes", "limit", "table", "rejected", "codes"])
+
+
+@lru_cache(maxsize=None)
+def compile_pool(use_letters=True, use_numbers=True, use_symbols=True):
+    """
+    Build the character pool for a set of options, once per option set
+
+    Args:
+        use_letters (bool): Include letters (a-z, A-Z)
+        use_numbers (bool): Include numbers (0-9)
+        use_symbols (bool): Include special characters
+
+    Returns:
+        CharacterPool: Pool and the lookup tables used to sample from it
+    """
+    options = (use_letters, use_numbers, use_symbols)
+    selected = [characters for (_, characters), used in zip(CHARACTER_CLASSES, options) if used]
+    # Ensure at least one character set is selected
+    if not selected:
+        raise ValueError("At least one character set must be selected")
+
+    characters = "".join(selected)
+    size = len(characters)
+    limit = 256 - 256 % size
+    table = bytes(ord(characters[byte % size]) if byte < limit else 0 for byte in range(256))
+    rejected = bytes(range(limit, 256))
+    codes = np.frombuffer(characters.encode("ascii"), dtype=np.uint8) if np is not None else None
+    return CharacterPool(characters, tuple(frozenset(chars) for chars in selected), limit, table, rejected, codes)
+
+
+def _random_characters(pool, count):
+    """
+    Draw `count` uniformly random characters from a pool
+
+    Bytes come from os.urandom in large blocks; bytes that would bias the
+    result are rejected and replaced from the next block.
+
+    Args:
+        pool (CharacterPool): Pool from compile_pool()
+        count (int): Number of characters
+
+    Returns:
+        str: Random characters
+    """
+    parts = []
+    remaining = count
+    while remaining > 0:
+        # Cover the expected rejections with a little slack, in blocks of at
+        # most ENTROPY_BLOCK_SIZE so one short password stays one small read
+        block = os.urandom(min(ENTROPY_BLOCK_SIZE, remaining * 256 // pool.limit + 16))
+        if pool.codes is not None:
+            data = np.frombuffer(block, dtype=np.uint8)
+            data = data[data < pool.limit]
+            chunk = pool.codes[data % len(pool.characters)].tobytes()
+        else:
+            chunk = block.translate(pool.table, pool.rejected)
+        chunk = chunk[:remaining]
+        parts.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(parts).decode("ascii")
+
+
+def _has_every_class(password, classes):
+    return all(not chars.isdisjoint(password) for chars in classes)
+
+
+def generate_passwords(n, length=12, use_letters=True, use_numbers=True, use_symbols=True,
+                       require_each=False):
+    """
+    Generate a batch of random passwords from the operating system's CSPRNG
+
+    Args:
+        n (int): Number of passwords
+        length (int): Length of each password
+        use_letters (bool): Include letters (a-z, A-Z)
+        use_numbers (bool): Include numbers (0-9)
+        use_symbols (bool): Include special characters
+        require_each (bool): Every password contains at least one character
+            of each selected set; passwords missing one are redrawn, so the
+            result stays uniform over all passwords that qualify
+
+    Returns:
+        list: Generated passwords
+    """
+    if n < 0 or length < 0:
+        raise ValueError("Password count and length cannot be negative")
+    pool = compile_pool(use_letters, use_numbers, use_symbols)
+    if require_each and length < len(pool.classes):
+        raise ValueError(f"Length must be at least {len(pool.classes)} to include every character set")
+
+    characters = _random_characters(pool, n * length)
+    passwords = [characters[i:i + length] for i in range(0, n * length, length)] if length else [""] * n
+    if not require_each:
+        return passwords
+
+    missing = [i for i, password in enumerate(passwords) if not _has_every_class(password, pool.classes)]
+    while missing:
+        characters = _random_characters(pool, len(missing) * length)
+        retry = []
+        for position, i in enumerate(missing):
+            password = characters[position * length:(position + 1) * length]
+            passwords[i] = password
+            if not _has_every_class(password, pool.classes):
+                retry.append(i)
+        missing = retry
+    return passwords
 
 
 def generate_password(length=12, use_letters=True, use_numbers=True, use_symbols=True):
@@ -15,27 +155,559 @@ def generate_password(length=12, use_letters=True, use_numbers=True, use_symbols
     Returns:
         str: Generated password
     """
-    # Define character sets
-    letters = string.ascii_letters
-    numbers = string.digits
-    symbols = string.punctuation
-    
-    # Create the character pool based on user preferences
-    char_pool = ''
-    if use_letters:
-        char_pool += letters
-    if use_numbers:
-        char_pool += numbers
-    if use_symbols:
-        char_pool += symbols
-        
-    # Ensure at least one character set is selected
-    if not char_pool:
-        raise ValueError("At least one character set must be selected")
-    
-    # Generate password
-    password = ''.join(random.choice(char_pool) for _ in range(length))
-    return password
+    return generate_passwords(1, length, use_letters, use_numbers, use_symbols)[0]
+
+
+class PasswordSet:
+    """
+    Remembers passwords by a 64-bit hash instead of their text
+
+    Two different passwords sharing a hash are so unlikely at realistic
+    volumes that the only effect would be one extra password generated.
+    """
+
+    def __init__(self):
+        self._hashes = set()
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, password):
+        """
+        Remember a password
+
+        Args:
+            password (str): Password to remember
+
+        Returns:
+            bool: True if it was not seen before
+        """
+        digest = int.from_bytes(hashlib.blake2b(password.encode(), digest_size=8).digest(), "big")
+        if digest in self._hashes:
+            return False
+        self._hashes.add(digest)
+        return True
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter for deduplicating very large batches
+
+    Memory is set up front from the expected number of passwords. A false
+    positive only discards a unique password, which is then replaced, so
+    the output never contains duplicates. That needs plenty of unused
+    passwords to replace it with, so iter_password_chunks only uses a
+    Bloom filter when the count is at most half of the possible passwords.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        Initialize an empty filter
+
+        Args:
+            capacity (int): Number of passwords expected
+            error_rate (float): Acceptable false positive rate at capacity
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, password):
+        """
+        Add a password
+
+        Args:
+            password (str): Password to add
+
+        Returns:
+            bool: True if it was (probably) not seen before
+        """
+        digest = hashlib.blake2b(password.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        new = False
+        for i in range(self.hash_count):
+            position = (first + i * second) % self.size
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+
+def _generate_chunk(options):
+    # Runs in a worker process; os.urandom gives each process its own
+    # independent stream from the kernel CSPRNG, so nothing is seeded here
+    n, length, use_letters, use_numbers, use_symbols, require_each = options
+    return generate_passwords(n, length, use_letters, use_numbers, use_symbols, require_each)
+
+
+def password_space(length, use_letters=True, use_numbers=True, use_symbols=True, require_each=False):
+    """
+    Count the different passwords the given options can produce
+
+    Args:
+        length (int): Length of each password
+        use_letters (bool): Include letters (a-z, A-Z)
+        use_numbers (bool): Include numbers (0-9)
+        use_symbols (bool): Include special characters
+        require_each (bool): Every password contains each selected character set
+
+    Returns:
+        int: Number of possible passwords
+    """
+    pool = compile_pool(use_letters, use_numbers, use_symbols)
+    if not require_each:
+        return len(pool.characters) ** length
+    # Inclusion-exclusion over the character sets a password could miss
+    sizes = [len(chars) for chars in pool.classes]
+    space = 0
+    for missing in range(1 << len(sizes)):
+        excluded = sum(size for i, size in enumerate(sizes) if missing >> i & 1)
+        space += (-1) ** bin(missing).count("1") * (len(pool.characters) - excluded) ** length
+    return space
+
+
+def _dedup_set(unique, count, space):
+    """
+    Build the duplicate filter named by the `unique` option
+
+    A Bloom filter's false positives shrink the passwords still available;
+    when count is more than half of space that could stall generation, so
+    the exact PasswordSet is used instead.
+    """
+    if unique is None:
+        return None
+    if unique not in ("set", "bloom"):
+        raise ValueError(f"Unknown deduplication method: {unique} (expected set or bloom)")
+    if space < count:
+        raise ValueError(f"Only {space} different results exist, {count} requested")
+    if unique == "bloom" and count <= space // 2:
+        return BloomFilter(count)
+    return PasswordSet()
+
+
+def _iter_chunks(generate, options, count, chunk_size, workers, seen):
+    """
+    Run a chunk generator in this process or across a process pool
+
+    Args:
+        generate (callable): Top-level function taking (size,) + options
+        options (tuple): Remaining arguments for generate
+        count (int): Number of results
+        chunk_size (int): Results per call
+        workers (int, optional): Worker processes (default: CPU count; 1 runs in this process)
+        seen (PasswordSet or BloomFilter, optional): Drops results already produced
+
+    Yields:
+        list: Chunks of results, count in total
+    """
+    workers = workers or os.cpu_count() or 1
+    remaining = count
+
+    if workers == 1:
+        while remaining > 0:
+            chunk = generate((min(chunk_size, remaining),) + options)
+            if seen is not None:
+                chunk = [result for result in chunk if seen.add(result)]
+            remaining -= len(chunk)
+            if chunk:
+                yield chunk
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        requested = 0
+        while remaining > 0:
+            # Keep every worker busy, but never more than two chunks each
+            while len(pending) < workers * 2 and requested < remaining:
+                size = min(chunk_size, remaining - requested)
+                pending.append(executor.submit(generate, (size,) + options))
+                requested += size
+            chunk = pending.popleft().result()
+            requested -= len(chunk)
+            if seen is not None:
+                chunk = [result for result in chunk if seen.add(result)]
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+            if chunk:
+                yield chunk
+        for future in pending:
+            future.cancel()
+
+
+def _write_chunks(chunks, output):
+    """Write chunks of lines to a path, an open text file or stdout"""
+    if isinstance(output, str):
+        with open(output, "w", encoding="utf-8") as stream:
+            return _write_chunks(chunks, stream)
+
+    stream = output or sys.stdout
+    written = 0
+    for chunk in chunks:
+        stream.write("\n".join(chunk) + "\n")
+        written += len(chunk)
+    stream.flush()
+    return written
+
+
+def iter_password_chunks(count, length=12, use_letters=True, use_numbers=True, use_symbols=True,
+                         require_each=False, chunk_size=STREAM_CHUNK_SIZE, workers=None, unique=None):
+    """
+    Generate passwords across a process pool, a chunk at a time
+
+    At most two chunks per worker are pending at once, so memory stays
+    bounded however many passwords are requested.
+
+    Args:
+        count (int): Number of passwords
+        length (int): Length of each password
+        use_letters (bool): Include letters (a-z, A-Z)
+        use_numbers (bool): Include numbers (0-9)
+        use_symbols (bool): Include special characters
+        require_each (bool): Every password contains each selected character set
+        chunk_size (int): Passwords generated per unit of work
+        workers (int, optional): Worker processes (default: CPU count; 1 runs in this process)
+        unique (str, optional): Drop duplicates with "set" (exact, grows with
+            count) or "bloom" (fixed memory; exact set when count is more
+            than half of the possible passwords)
+
+    Yields:
+        list: Chunks of passwords, count in total
+    """
+    # Check the options here rather than in a worker
+    compile_pool(use_letters, use_numbers, use_symbols)
+    options = (length, use_letters, use_numbers, use_symbols, require_each)
+    seen = _dedup_set(unique, count, password_space(*options)) if unique else None
+    yield from _iter_chunks(_generate_chunk, options, count, chunk_size, workers, seen)
+
+
+def iter_passwords(count, length=12, **options):
+    """
+    Generate passwords one at a time; see iter_password_chunks for the options
+
+    Args:
+        count (int): Number of passwords
+        length (int): Length of each password
+        **options: Passed to iter_password_chunks
+
+    Yields:
+        str: Each password
+    """
+    for chunk in iter_password_chunks(count, length, **options):
+        yield from chunk
+
+
+def write_passwords(count, output=None, length=12, **options):
+    """
+    Stream passwords to a file or stdout, one per line
+
+    Args:
+        count (int): Number of passwords
+        output (str or file, optional): Path or open text file (default: sys.stdout)
+        length (int): Length of each password
+        **options: Passed to iter_password_chunks
+
+    Returns:
+        int: Number of passwords written
+    """
+    return _write_chunks(iter_password_chunks(count, length, **options), output)
+
+
+class Wordlist:
+    """
+    Memory-mapped wordlist with O(1) access to any word
+
+    An index of line start offsets is built once and saved next to the
+    wordlist as <path>.idx, stamped with the wordlist's size and
+    modification time; later opens only map the two files, so every
+    process shares the same page cache instead of loading its own list.
+    Lines may be plain words or diceware-style "11111<tab>word"; the last
+    field of each non-empty line is the word.
+    """
+
+    # Offsets are stored as unsigned 64-bit integers, after a header of the
+    # magic number, the wordlist's size and mtime_ns, and its number of
+    # distinct words as written and capitalized; a wordlist whose size or
+    # mtime differs from the header gets a new index
+    OFFSET_FORMAT = "Q"
+    INDEX_MAGIC = int.from_bytes(b"WORDIDX2", "big")
+    HEADER_FIELDS = 5
+
+    def __init__(self, path, index_path=None):
+        """
+        Open a wordlist, building its offset index if it is missing or stale
+
+        Args:
+            path (str): Wordlist file, one word per line (UTF-8)
+            index_path (str, optional): Where to keep the index (default: path + ".idx")
+        """
+        self.path = path
+        self.index_path = index_path or path + ".idx"
+        self._file = open(path, "rb")
+        try:
+            self._words = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Wordlist {path} is empty") from None
+        self._index_file = None
+        self._index_map = None
+        self._index_view = None
+        self.distinct_words = 0
+        self.distinct_capitalized = 0
+        self._offsets = self._load_index()
+        if not len(self._offsets):
+            self.close()
+            raise ValueError(f"Wordlist {path} has no words")
+
+    def _build_offsets(self):
+        offsets = array(self.OFFSET_FORMAT)
+        # Lines may repeat a word, so the distinct words are counted separately
+        words = set()
+        position = 0
+        for line in iter(self._words.readline, b""):
+            if line.strip():
+                offsets.append(position)
+                words.add(line.split()[-1])
+            position += len(line)
+        self._words.seek(0)
+        self.distinct_words = len(words)
+        self.distinct_capitalized = len({word.decode("utf-8").capitalize() for word in words})
+        return offsets
+
+    def _index_stamp(self):
+        """Header fields identifying the exact wordlist an index was built from"""
+        status = os.fstat(self._file.fileno())
+        return array(self.OFFSET_FORMAT, [self.INDEX_MAGIC, status.st_size, status.st_mtime_ns]).tobytes()
+
+    def _load_index(self):
+        stamp = self._index_stamp()
+        header_size = self.HEADER_FIELDS * array(self.OFFSET_FORMAT).itemsize
+        try:
+            with open(self.index_path, "rb") as index:
+                header = index.read(header_size)
+            fresh = len(header) == header_size and header.startswith(stamp)
+        except OSError:
+            fresh = False
+
+        if fresh:
+            self.distinct_words, self.distinct_capitalized = array(self.OFFSET_FORMAT, header[len(stamp):])
+        else:
+            offsets = self._build_offsets()
+            try:
+                # Write under a temporary name so concurrent openers never see half an index
+                temporary = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(temporary, "wb") as index:
+                    index.write(stamp)
+                    array(self.OFFSET_FORMAT, [self.distinct_words, self.distinct_capitalized]).tofile(index)
+                    offsets.tofile(index)
+                os.replace(temporary, self.index_path)
+            except OSError:
+                # Read-only location: keep this process's copy in memory
+                return offsets
+
+        self._index_file = open(self.index_path, "rb")
+        self._index_map = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_view = memoryview(self._index_map)
+        return self._index_view[header_size:].cast(self.OFFSET_FORMAT)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, i):
+        start = self._offsets[i]
+        end = self._words.find(b"\n", start)
+        line = self._words[start:end if end != -1 else len(self._words)]
+        return line.split()[-1].decode("utf-8")
+
+    @property
+    def bits_per_word(self):
+        """Entropy contributed by each uniformly chosen word"""
+        return math.log2(len(self))
+
+    def random_word(self):
+        """Return a word chosen with the secrets module's CSPRNG"""
+        return self[secrets.randbelow(len(self._offsets))]
+
+    def close(self):
+        """Unmap the wordlist and its index"""
+        for view in (self._offsets, self._index_view):
+            if isinstance(view, memoryview):
+                view.release()
+        for resource in (self._index_map, self._index_file, self._words, self._file):
+            if resource is not None:
+                resource.close()
+
+
+@lru_cache(maxsize=None)
+def open_wordlist(path):
+    """
+    Return the Wordlist for a path, opened once per process
+
+    Args:
+        path (str): Wordlist file
+
+    Returns:
+        Wordlist: Memory-mapped wordlist
+    """
+    return Wordlist(path)
+
+
+def generate_passphrases(n, wordlist, words=6, separator="-", capitalize=False):
+    """
+    Generate a batch of diceware-style passphrases
+
+    Args:
+        n (int): Number of passphrases
+        wordlist (str or Wordlist): Wordlist path or an open Wordlist
+        words (int): Words per passphrase
+        separator (str): Text between words
+        capitalize (bool): Capitalize each word
+
+    Returns:
+        list: Generated passphrases
+    """
+    if n < 0 or words < 1:
+        raise ValueError("Passphrase count cannot be negative and needs at least one word")
+    if isinstance(wordlist, str):
+        wordlist = open_wordlist(wordlist)
+    passphrases = []
+    for _ in range(n):
+        chosen = [wordlist.random_word() for _ in range(words)]
+        if capitalize:
+            chosen = [word.capitalize() for word in chosen]
+        passphrases.append(separator.join(chosen))
+    return passphrases
+
+
+def generate_passphrase(wordlist, words=6, separator="-", capitalize=False):
+    """
+    Generate a diceware-style passphrase
+
+    Args:
+        wordlist (str or Wordlist): Wordlist path or an open Wordlist
+        words (int): Number of words
+        separator (str): Text between words
+        capitalize (bool): Capitalize each word
+
+    Returns:
+        str: Generated passphrase
+    """
+    return generate_passphrases(1, wordlist, words, separator, capitalize)[0]
+
+
+def _generate_passphrase_chunk(options):
+    # Workers map the same wordlist and index files, sharing their pages
+    n, path, words, separator, capitalize = options
+    return generate_passphrases(n, path, words, separator, capitalize)
+
+
+def iter_passphrase_chunks(count, wordlist, words=6, separator="-", capitalize=False,
+                           chunk_size=STREAM_CHUNK_SIZE, workers=None, unique=None):
+    """
+    Generate passphrases across a process pool, a chunk at a time
+
+    Args:
+        count (int): Number of passphrases
+        wordlist (str): Wordlist path
+        words (int): Words per passphrase
+        separator (str): Text between words
+        capitalize (bool): Capitalize each word
+        chunk_size (int): Passphrases generated per unit of work
+        workers (int, optional): Worker processes (default: CPU count; 1 runs in this process)
+        unique (str, optional): Drop duplicates with "set" or "bloom"
+
+    Yields:
+        list: Chunks of passphrases, count in total
+    """
+    # Build the index here once, before any worker opens the wordlist
+    opened = open_wordlist(wordlist)
+    # Repeated words do not add passphrases, so only distinct words count
+    size = opened.distinct_capitalized if capitalize else opened.distinct_words
+    options = (wordlist, words, separator, capitalize)
+    seen = _dedup_set(unique, count, size ** words) if unique else None
+    yield from _iter_chunks(_generate_passphrase_chunk, options, count, chunk_size, workers, seen)
+
+
+def write_passphrases(count, wordlist, output=None, **options):
+    """
+    Stream passphrases to a file or stdout, one per line
+
+    Args:
+        count (int): Number of passphrases
+        wordlist (str): Wordlist path
+        output (str or file, optional): Path or open text file (default: sys.stdout)
+        **options: Passed to iter_passphrase_chunks
+
+    Returns:
+        int: Number of passphrases written
+    """
+    return _write_chunks(iter_passphrase_chunks(count, wordlist, **options), output)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate random passwords")
+    parser.add_argument("-n", "--count", type=int, default=1, help="number of passwords")
+    parser.add_argument("-l", "--length", type=int, default=12)
+    parser.add_argument("--no-letters", dest="use_letters", action="store_false")
+    parser.add_argument("--no-numbers", dest="use_numbers", action="store_false")
+    parser.add_argument("--no-symbols", dest="use_symbols", action="store_false")
+    parser.add_argument("--require-each", action="store_true",
+                        help="use every selected character type in each password")
+    parser.add_argument("-o", "--output", help="file to write to (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE)
+    parser.add_argument("--unique", choices=("set", "bloom"), help="drop duplicate passwords")
+    parser.add_argument("--wordlist", help="generate passphrases from this wordlist instead")
+    parser.add_argument("--words", type=int, default=6, help="words per passphrase")
+    parser.add_argument("--separator", default="-", help="text between passphrase words")
+    parser.add_argument("--capitalize", action="store_true", help="capitalize passphrase words")
+    return parser.parse_args(argv)
+
+
+def run_cli(argv=None):
+    """Generate passwords non-interactively from command-line arguments"""
+    args = parse_args(argv)
+    try:
+        if args.wordlist:
+            written = write_passphrases(
+                args.count,
+                args.wordlist,
+                args.output,
+                words=args.words,
+                separator=args.separator,
+                capitalize=args.capitalize,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                unique=args.unique
+            )
+        else:
+            written = write_passwords(
+                args.count,
+                args.output,
+                args.length,
+                use_letters=args.use_letters,
+                use_numbers=args.use_numbers,
+                use_symbols=args.use_symbols,
+                require_each=args.require_each,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                unique=args.unique
+            )
+    except (OSError, ValueError) as e:
+        print("Error:", str(e), file=sys.stderr)
+        return 1
+    if args.output:
+        kind = "passphrases" if args.wordlist else "passwords"
+        print(f"Wrote {written} {kind} to {args.output}")
+    return 0
 
 
 def main():
@@ -48,16 +720,25 @@ def main():
         use_letters = input("Include letters? (Y/n): ").lower() != 'n'
         use_numbers = input("Include numbers? (Y/n): ").lower() != 'n'
         use_symbols = input("Include symbols? (Y/n): ").lower() != 'n'
+        require_each = input("Use every selected character type? (y/N): ").lower() == 'y'
+        count = int(input("How many passwords? (default 1): ") or 1)
         
-        # Generate and display password
-        password = generate_password(
+        # Generate and display passwords
+        passwords = generate_passwords(
+            count,
             length=length,
             use_letters=use_letters,
             use_numbers=use_numbers,
-            use_symbols=use_symbols
+            use_symbols=use_symbols,
+            require_each=require_each
         )
         
-        print("\nGenerated Password:", password)
+        if count == 1:
+            print("\nGenerated Password:", passwords[0])
+        else:
+            print("\nGenerated Passwords:")
+            for password in passwords:
+                print(password)
         
     except ValueError as e:
         print("Error:", str(e))
@@ -66,4 +747,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Any arguments select the non-interactive mode
+    if len(sys.argv) > 1:
+        sys.exit(run_cli())
     main()
@@ -0,0 +1,139 @@
+import csv
+import json
+import sys
+
+# Output formats understood by RecordRenderer
+FORMATS = ("human", "jsonl", "csv")
+
+
+class RecordRenderer:
+    """
+    Writes records to a stream in human, JSON Lines or CSV format
+
+    Output is collected in memory and written in large chunks, so a long
+    listing costs a handful of write calls instead of several per record.
+    Records are consumed one at a time and the first one is written
+    immediately, so output from an iterator starts before it is exhausted.
+    """
+
+    def __init__(self, fmt="human", formatter=None, stream=None, fields=None, buffer_size=65536):
+        """
+        Initialize the renderer
+
+        Args:
+            fmt (str): One of FORMATS
+            formatter (callable, optional): Turns a record into its human-readable
+                text; required for the human format
+            stream (file, optional): Where to write (default: sys.stdout)
+            fields (list, optional): CSV columns; other keys are left out (default:
+                keys of the first record, and a later record with other keys
+                raises ValueError rather than losing them)
+            buffer_size (int): Characters collected before each write
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown output format: {fmt} (expected one of {', '.join(FORMATS)})")
+        if fmt == "human" and formatter is None:
+            raise ValueError("The human format needs a formatter")
+        self.fmt = fmt
+        self.formatter = formatter
+        self.stream = stream or sys.stdout
+        self.fields = fields
+        self.buffer_size = buffer_size
+        self._parts = []
+        self._size = 0
+        self._csv_writer = None
+
+    def write(self, text):
+        """
+        Add text to the buffer, writing it out once the buffer is full
+
+        Args:
+            text (str): Text to write
+        """
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write out everything buffered so far"""
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+        self.stream.flush()
+
+    def render_record(self, record):
+        """
+        Add one record in the configured format
+
+        Args:
+            record (dict): Record to render
+        """
+        if self.fmt == "human":
+            self.write(self.formatter(record))
+        elif self.fmt == "jsonl":
+            # str() covers datetimes and MongoDB ObjectIds
+            self.write(json.dumps(record, default=str) + "\n")
+        else:
+            if self._csv_writer is None:
+                fields = self.fields or list(record)
+                # The renderer itself is the file the csv module writes to;
+                # extra keys are only dropped when the columns were chosen explicitly
+                self._csv_writer = csv.DictWriter(
+                    self, fieldnames=fields, lineterminator="\n",
+                    extrasaction="ignore" if self.fields else "raise"
+                )
+                self._csv_writer.writeheader()
+            try:
+                self._csv_writer.writerow(record)
+            except ValueError as e:
+                raise ValueError(f"{e}; pass fields to choose the CSV columns") from None
+
+    def render(self, records, header=None, empty_message=None):
+        """
+        Render every record and flush
+
+        Args:
+            records (iterable): Records to render, e.g. a list or a generator
+            header (str, optional): Text written before the first record (human format only)
+            empty_message (str, optional): Text written when there are no records (human format only)
+
+        Returns:
+            int: Number of records rendered
+        """
+        count = 0
+        for record in records or ():
+            if not count and header and self.fmt == "human":
+                self.write(header)
+            self.render_record(record)
+            count += 1
+            if count == 1:
+                # Show the first record right away, then write in chunks
+                self.flush()
+        if not count and empty_message and self.fmt == "human":
+            self.write(empty_message)
+        self.flush()
+        return count
+
+
+def render_records(records, formatter=None, fmt="human", stream=None, header=None,
+                   empty_message=None, fields=None):
+    """
+    Render records through a buffered RecordRenderer
+
+    Args:
+        records (iterable): Records to render
+        formatter (callable, optional): Human-readable text for a record
+        fmt (str): One of FORMATS
+        stream (file, optional): Where to write (default: sys.stdout)
+        header (str, optional): Text written before the first record (human format only)
+        empty_message (str, optional): Text written when there are no records (human format only)
+        fields (list, optional): CSV columns (default: keys of the first record;
+            see RecordRenderer)
+
+    Returns:
+        int: Number of records rendered
+    """
+    renderer = RecordRenderer(fmt, formatter, stream, fields)
+    return renderer.render(records, header, empty_message)